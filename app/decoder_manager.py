@@ -8,9 +8,10 @@ import json
 import logging
 import shutil
 import time
-from typing import Dict, List, Any, Optional
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
-from payload_decoder import PayloadDecoder
+from payload_decoder import PayloadDecoder, payload_hex
 
 
 class DecoderManager:
@@ -171,7 +172,6 @@ module.exports = { decode };
             # Validiere XML für .xml (IODD) Dateien
             elif filename.endswith('.xml'):
                 try:
-                    import xml.etree.ElementTree as ET
                     ET.fromstring(content_str)
                 except ET.ParseError as e:
                     return {
@@ -241,12 +241,12 @@ module.exports = { decode };
         """Lösche Decoder."""
         return self.payload_decoder.delete_decoder(decoder_name)
     
-    def decode_sensor_payload(self, sensor_eui: str, payload_bytes: List[int], 
-                             metadata: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Dekodiere Sensor-Payload."""
-        return self.payload_decoder.decode_payload(sensor_eui, payload_bytes, metadata)
+    def decode_sensor_payload(self, sensor_eui: str, payload_bytes: Union[List[int], bytes], 
+                             metadata: Dict[str, Any] = None, verbose: bool = True) -> Dict[str, Any]:
+        """Dekodiere Sensor-Payload (verbose=False: nur Feldwerte ohne Einheit/Beschreibung)."""
+        return self.payload_decoder.decode_payload(sensor_eui, payload_bytes, metadata, verbose)
     
-    def test_decoder(self, decoder_name: str, test_payload: List[int]) -> Dict[str, Any]:
+    def test_decoder(self, decoder_name: str, test_payload: Union[List[int], bytes]) -> Dict[str, Any]:
         """Teste Decoder mit Test-Payload."""
         try:
             # Erstelle temporäre Zuweisung für Test
@@ -273,7 +273,7 @@ module.exports = { decode };
             return result if result else {
                 'decoded': False,
                 'reason': 'Test fehlgeschlagen',
-                'raw_data': test_payload
+                'raw_data': payload_hex(test_payload)
             }
             
         except Exception as e:
@@ -281,9 +281,13 @@ module.exports = { decode };
             return {
                 'decoded': False,
                 'reason': f'Test error: {str(e)}',
-                'raw_data': test_payload
+                'raw_data': payload_hex(test_payload)
             }
     
+    def shutdown(self):
+        """Beende Decoder Engine (Registry speichern, Node.js Worker stoppen)."""
+        self.payload_decoder.shutdown()
+    
     def get_decoder_info(self, decoder_name: str) -> Optional[Dict[str, Any]]:
         """Gib detaillierte Decoder-Informationen zurück."""
         decoders = self.payload_decoder.get_available_decoders()
@@ -0,0 +1,45 @@
+"""
+JSON Hilfsfunktionen mit optionalem orjson
+Gemeinsame Kodierung für Decoder-Registry, Node.js Worker, MQTT, Service Center und Web GUI
+"""
+
+import json
+from typing import Any
+
+# orjson ist ein schnellerer JSON-Kodierer (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    # orjson.JSONDecodeError ist eine Unterklasse von json.JSONDecodeError
+    loads = orjson.loads
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Kompaktes JSON (ohne Leerzeichen) als UTF-8 Bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps_str(obj: Any) -> str:
+        """Kompaktes JSON (ohne Leerzeichen) als String."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def dumps_indent(obj: Any) -> bytes:
+        """Eingerücktes JSON (2 Leerzeichen) als UTF-8 Bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    loads = json.loads
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Kompaktes JSON (ohne Leerzeichen) als UTF-8 Bytes."""
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def dumps_str(obj: Any) -> str:
+        """Kompaktes JSON (ohne Leerzeichen) als String."""
+        return json.dumps(obj, separators=(',', ':'))
+
+    def dumps_indent(obj: Any) -> bytes:
+        """Eingerücktes JSON (2 Leerzeichen) als UTF-8 Bytes."""
+        return json.dumps(obj, indent=2).encode('utf-8')
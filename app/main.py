@@ -10,6 +10,7 @@ import json
 import time
 import logging
 import threading
+from datetime import datetime
 from typing import Dict, Any
 
 # Import modules
@@ -224,6 +225,7 @@ class BSSCIAddon:
                 data.get('rssi', -100)
             )
         }
+        self._notify_web_gui('sensors')
         
         # Home Assistant Discovery - Individual Sensor Discovery
         if self.config['auto_discovery'] and self.mqtt_manager and decoded_payload:
@@ -267,6 +269,7 @@ class BSSCIAddon:
             'data': data,
             'status': 'online' if data else 'offline'
         }
+        self._notify_web_gui('basestations')
         
         logging.info(f"🗄️ Base Station {bs_eui} in Dictionary gespeichert. Anzahl Base Stations: {len(self.base_stations)}")
         
@@ -285,6 +288,7 @@ class BSSCIAddon:
             'last_seen': time.time(),
             'status': status
         }
+        self._notify_web_gui('basestations')
         
         # Home Assistant Discovery für Base Station
         if self.config['auto_discovery']:
@@ -304,7 +308,6 @@ class BSSCIAddon:
         
         # Prüfe manuelle Metadaten zuerst
         try:
-            import json
             metadata_file = '/data/manual_sensor_metadata.json' if os.path.exists('/data') else 'manual_sensor_metadata.json'
             with open(metadata_file, 'r') as f:
                 manual_metadata = json.load(f)
@@ -400,7 +403,6 @@ class BSSCIAddon:
         
         # Prüfe manuelle Metadaten zuerst
         try:
-            import json
             metadata_file = '/data/manual_basestation_metadata.json' if os.path.exists('/data') else 'manual_basestation_metadata.json'
             with open(metadata_file, 'r') as f:
                 manual_metadata = json.load(f)
@@ -585,7 +587,6 @@ class BSSCIAddon:
         if self.mqtt_manager:
             logging.info(f"📊 Sensor Update: {sensor_eui} → {len(data.get('data', []))} bytes")
             # JSON State zu HA senden
-            import json
             if self.mqtt_manager.ha_client:
                 success = self.mqtt_manager.ha_client.publish(state_topic, json.dumps(state_data), retain=False)
                 if not success:
@@ -671,7 +672,6 @@ class BSSCIAddon:
             return "Unknown"
         
         try:
-            from datetime import datetime
             timestamp_s = timestamp_ns / 1_000_000_000
             dt = datetime.fromtimestamp(timestamp_s)
             return dt.strftime("%Y-%m-%d %H:%M:%S")
@@ -776,6 +776,7 @@ class BSSCIAddon:
         if sensor_eui in self.sensors:
             # Sensor aus lokaler Liste entfernen
             del self.sensors[sensor_eui]
+            self._notify_web_gui('sensors')
             
             # Discovery-Konfiguration löschen
             unique_id = f"bssci_sensor_{sensor_eui}"
@@ -786,6 +787,11 @@ class BSSCIAddon:
             return True
         return False
     
+    def _notify_web_gui(self, kind: str):
+        """Informiere verbundene Browser über geänderte Daten."""
+        if self.web_gui:
+            self.web_gui.notify_change(kind)
+    
     def get_sensor_list(self) -> Dict[str, Any]:
         """Gibt Liste aller Sensoren zurück."""
         return self.sensors.copy()
@@ -806,6 +812,9 @@ class BSSCIAddon:
         if self.web_gui:
             self.web_gui.shutdown()
         
+        if self.decoder_manager:
+            self.decoder_manager.shutdown()
+        
         logging.info("Add-on beendet")
 
 
@@ -12,6 +12,8 @@ from typing import Callable, Optional, Dict, Any
 
 import paho.mqtt.client as mqtt
 
+import json_compat
+
 
 class MQTTManager:
     """Dual MQTT Manager für mioty Daten + Home Assistant Integration."""
@@ -234,7 +236,7 @@ class MQTTManager:
     def _handle_bssci_message(self, topic_parts: list, payload: str):
         """Verarbeite BSSCI MQTT Nachrichten."""
         try:
-            data = json.loads(payload)
+            data = json_compat.loads(payload)
             
             if len(topic_parts) >= 4 and topic_parts[1] == "ep":
                 sensor_eui = topic_parts[2]
@@ -269,7 +271,7 @@ class MQTTManager:
             return False
         
         try:
-            payload = json.dumps(config) if isinstance(config, dict) else config
+            payload = json_compat.dumps_str(config) if isinstance(config, dict) else config
             result = self.ha_client.publish(topic, payload, retain=True)
             return result.rc == mqtt.MQTT_ERR_SUCCESS
             
@@ -290,7 +292,7 @@ class MQTTManager:
             
             # Attributes Topic
             attr_topic = f"homeassistant/sensor/{unique_id}/attributes"
-            attr_payload = json.dumps(attributes)
+            attr_payload = json_compat.dumps_str(attributes)
             self.ha_client.publish(attr_topic, attr_payload)
             
             return True
@@ -305,7 +307,7 @@ class MQTTManager:
             return False
         
         try:
-            payload = json.dumps(config)
+            payload = json_compat.dumps_str(config)
             result = self.client.publish(topic, payload)
             return result.rc == mqtt.MQTT_ERR_SUCCESS
             
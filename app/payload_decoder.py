@@ -4,20 +4,422 @@ Unterstützt mioty Blueprint Decoder und Sentinum .js Files
 """
 
 import os
-import json
+import base64
+import functools
+import hashlib
+import itertools
 import logging
+import math
 import re
+import select
+import struct
 import subprocess
-import tempfile
+import threading
 import time
 import xml.etree.ElementTree as ET
+from collections import defaultdict
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 
+import json_compat
+
+# Logger des Moduls (einmal geholt, Nachrichten mit %-Argumenten werden erst bei Bedarf formatiert)
+_logger = logging.getLogger(__name__)
+
+# Modul-lokale Uhr (spart den Attribut-Lookup auf time bei jeder Zuweisung)
+_now = time.time
+
+# Magnus-Formel (Taupunkt): Konstanten und modul-lokaler Logarithmus
+MAGNUS_A = 17.27
+MAGNUS_B = 237.7
+_log = math.log
+
+# NumPy für vektorisiertes Unpacking (optional)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Numba JIT für die Byte-Unpack-Kernels (optional, benötigt NumPy)
+# Kompilierte Kernels in /data ablegen, damit sie Add-on Neustarts und Updates überleben
+if os.path.exists('/data'):
+    os.environ.setdefault('NUMBA_CACHE_DIR', '/data/numba_cache')
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+# watchdog meldet neue/geänderte Decoder-Dateien, statt das Verzeichnis neu zu scannen (optional)
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+# Sentinum Header: base_id, major, minor, product, up_cnt, battery, internal_temperature
+SENTINUM_HEADER_LENGTH = 7
+SENTINUM_HEADER_SIGNATURE = 'UniTuple(float64, 7)(Array(uint8, 1, "C", readonly=True))'
+
+# Febris Messwerte als 16-Bit Big-Endian Wörter ab Byte 3: Batterie, Innentemperatur, Feuchte
+FEBRIS_WORD_OFFSET = 3
+FEBRIS_WORD_DIVISORS = (1000.0, 10.0, 100.0)
+FEBRIS_WORD_OFFSETS = (0.0, -100.0, 0.0)
+if NUMPY_AVAILABLE:
+    _FEBRIS_WORD_DIVISORS_NP = np.array(FEBRIS_WORD_DIVISORS)
+    _FEBRIS_WORD_OFFSETS_NP = np.array(FEBRIS_WORD_OFFSETS)
+
+# Ausgabe-Schemas der Python-Decoder: (Feld, Einheit, Beschreibung, Nachkommastellen oder None)
+FEBRIS_PYTHON_SCHEMA = (
+    ('battery_voltage', 'V', 'Battery Voltage', 2),
+    ('humidity', '%RH', 'Relative Humidity', 1),
+    ('base_id', '', 'Base ID', None),
+    ('major_version', '', 'Major Version', None),
+    ('minor_version', '', 'Minor Version', None),
+    ('product_version', '', 'Product Version', None),
+    ('up_cnt', '', 'Up Count', None),
+    ('internal_temperature', '°C', 'Internal Temperature', 1),
+    ('alarm', '', 'Alarm', None),
+    ('dew_point', '°C', 'Dew Point', 1),
+)
+JUNO_PYTHON_SCHEMA = (
+    ('battery_voltage', 'V', 'Battery Voltage', 2),
+    ('temperature', '°C', 'Temperature', 1),
+    ('humidity', '%RH', 'Relative Humidity', 1),
+    ('base_id', '', 'Base ID', None),
+    ('major_version', '', 'Major Version', None),
+    ('minor_version', '', 'Minor Version', None),
+    ('product_version', '', 'Product Version', None),
+    ('up_cnt', '', 'Up Count', None),
+    ('internal_temperature', '°C', 'Internal Temperature', 1),
+)
+
+# Ausgabe-Schemas der Sentinum Engine Decoder (Reihenfolge = Reihenfolge der Ausgabe)
+FEBRIS_SENTINUM_SCHEMA = (
+    ('base_id', '', 'Base Id', 2),
+    ('major_version', '', 'Major Version', 2),
+    ('minor_version', '', 'Minor Version', 2),
+    ('product_version', '', 'Product Version', 2),
+    ('up_cnt', '', 'Up Cnt', 2),
+    ('battery_voltage', 'V', 'Battery Voltage', 2),
+    ('internal_temperature', '°C', 'Internal Temperature', 2),
+    ('humidity', '%RH', 'Relative Humidity', 2),
+    ('alarm', '', 'Alarm', 2),
+    ('dew_point', '°C', 'Dew Point', 2),
+)
+IOLINK_ADAPTER_SCHEMA = (
+    ('control_byte', '', 'Control Byte', None),
+    ('control_bit_0', '', 'Control Bit 0', None),
+    ('control_bit_1', '', 'Control Bit 1', None),
+    ('control_bit_2', '', 'Control Bit 2', None),
+    ('control_bit_3', '', 'Control Bit 3', None),
+    ('pd_in_length', 'bytes', 'Pd In Length', None),
+    ('vendor_id', '', 'Vendor ID', None),
+    ('vendor_id_hex', '', 'Vendor ID (Hex)', None),
+    ('device_id', '', 'Device ID', None),
+    ('device_id_hex', '', 'Device ID (Hex)', None),
+    ('process_data', 'hex', 'Process Data', None),
+    ('process_data_hex', 'hex', 'Process Data', None),
+    ('event_data', '', 'Event Data', None),
+    ('adapter_event', '', 'Adapter Event', None),
+)
+GENERIC_SENTINUM_SCHEMA = (
+    ('sensor_id', '', 'Sensor Id', None),
+    ('packet_type', '', 'Packet Type', None),
+    ('value1', '', 'Value1', None),
+    ('value2', '', 'Value2', None),
+)
+
+# Feste Kopfteile der Ergebnis-Dicts (pro Dekodierung nur noch data/raw_data ergänzen)
+_FEBRIS_PYTHON_RESULT = {'decoded': True, 'decoder_type': 'febris_python', 'decoder_name': 'Febris TH (Python)'}
+_JUNO_PYTHON_RESULT = {'decoded': True, 'decoder_type': 'juno_python', 'decoder_name': 'Juno TH (Python)'}
+_FEBRIS_SENTINUM_RESULT = {'decoded': True, 'decoder_type': 'sentinum_febris',
+                           'decoder_name': 'Febris TH (Sentinum Engine)'}
+_JUNO_SENTINUM_RESULT = {'decoded': True, 'decoder_type': 'sentinum_juno',
+                         'decoder_name': 'Juno TH (Sentinum Engine)'}
+_IOLINK_ADAPTER_RESULT = {'decoded': True, 'decoder_type': 'iolink_adapter',
+                          'decoder_name': 'IO-Link Adapter (mioty)'}
+
+# Anzeigenamen der Sentinum JS-Engines (einmal beim Import statt str.title() pro Dekodierung)
+_ENGINE_TITLES = {engine: engine.title() for engine in ('juno', 'febris')}
+
+# Unterstützte Decoder-Dateien: Dateiendung -> Decoder-Typ
+DECODER_SUFFIX_TYPES = {
+    '.json': 'blueprint',
+    '.js': 'javascript',
+    '.xml': 'iodd',
+}
+
+# Blueprint Feldtypen mit fester Länge -> struct Format (Big-Endian)
+BLUEPRINT_STRUCT_CODES = {
+    ('uint8', 1): 'B',
+    ('uint16', 2): 'H',
+    ('float', 4): 'f',
+}
+# Feldweiser Fallback: (Typ, Länge) -> (unpack_from, Wert bei abgeschnittenem Feld)
+BLUEPRINT_FIELD_READERS = {
+    key: (struct.Struct('>' + code).unpack_from, 0.0 if code == 'f' else 0)
+    for key, code in BLUEPRINT_STRUCT_CODES.items()
+}
+
+
+def _compile_blueprint_decoder(fields: tuple, layout: struct.Struct):
+    """Erzeuge für ein festes Blueprint-Layout eine Dekodierfunktion aus geradlinigem Code.
+    
+    Feldnamen, Einheiten und Skalierung werden als Default-Argumente gebunden (keine
+    Werte im generierten Quelltext), pro Aufruf bleiben ein unpack und ein Dict-Literal.
+    """
+    namespace = {'_unpack': layout.unpack_from}
+    params = ['b', '_unpack=_unpack']
+    items = []
+    for i, (field_name, _, _, scale, offset, unit, description) in enumerate(fields):
+        for prefix, value in (('_k', field_name), ('_s', scale), ('_o', offset),
+                              ('_u', unit), ('_d', description)):
+            namespace[f'{prefix}{i}'] = value
+            params.append(f'{prefix}{i}={prefix}{i}')
+        items.append(f"_k{i}: {{'value': v{i} * _s{i} + _o{i}, 'unit': _u{i}, 'description': _d{i}}}")
+    
+    source = (
+        f"def _decode({', '.join(params)}):\n"
+        f"    {''.join(f'v{i}, ' for i in range(len(fields)))}= _unpack(b)\n"
+        f"    return {{{', '.join(items)}}}\n"
+    )
+    exec(compile(source, '<blueprint>', 'exec'), namespace)
+    return namespace['_decode']
+
+# Big-Endian Mehrbyte-Felder der Sentinum Python-Decoder (ein C-Aufruf pro Lesezugriff)
+_U16_BE = struct.Struct('>H')
+_U16_PAIR_BE = struct.Struct('>2H')
+
+# Sentinum Header ohne Numba: Base ID/Version, Minor/Product, Upload Counter, Batterie, Temperatur
+_FEBRIS_HEADER = struct.Struct('>BBBHH')
+_JUNO_HEADER = struct.Struct('>BBBHB')
+_FEBRIS_WORDS = struct.Struct('>3H')
+
+# Erwartbare Fehler beim Parsen kurzer/fehlerhafter Payloads; Programmierfehler werden nicht abgefangen
+_PAYLOAD_ERRORS = (IndexError, ValueError, KeyError, struct.error)
+
+# Generischer mioty Header: Sensor ID, Pakettyp, zwei 16-Bit Big-Endian Werte
+_GENERIC_HEADER = struct.Struct('>BBHH')
+
+# IO-Link Adapter Header: Control Byte, PD-in Länge, Vendor ID, (Byte 4 übersprungen), Device ID
+_IOLINK_HEADER = struct.Struct('>BBHxH')
+# Control Bits 0-3 als Bool-Tupel für jedes mögliche untere Nibble des Control Bytes
+_IOLINK_CONTROL_BITS = tuple(tuple(bool(nibble >> bit & 1) for bit in range(4)) for nibble in range(16))
+IODDFINDER_URL = "https://ioddfinder.com/devices?vendor={vendor_id}&device={device_id}"
+
+
+@functools.lru_cache(maxsize=256)
+def _iolink_id_strings(vendor_id: int, device_id: int) -> tuple:
+    """Hex-Darstellungen und IODDfinder-Link je Vendor/Device (wenige Geräte, oft wiederholt)."""
+    return (f"0x{vendor_id:04X}", f"0x{device_id:04X}",
+            IODDFINDER_URL.format(vendor_id=vendor_id, device_id=device_id))
+
+
+# Explizite Signatur: Kompilierung (bzw. Laden aus dem Cache) beim Import statt beim ersten Payload.
+# Kein fastmath - die Divisionen sollen bitgleich zur Python-Variante bleiben.
+if NUMBA_AVAILABLE:
+    @njit(SENTINUM_HEADER_SIGNATURE, cache=True, boundscheck=False)
+    def _febris_unpack(b):
+        """Febris Header Kernel (Bytes 0-6, Temperatur 16 Bit mit 0.1°C und -100°C Offset)."""
+        return (
+            float(b[0] >> 4),
+            float(b[0] & 0x0F),
+            float(b[1] >> 4),
+            float(b[1] & 0x0F),
+            float(b[2]),
+            ((int(b[3]) << 8) | int(b[4])) / 1000.0,
+            ((int(b[5]) << 8) | int(b[6])) / 10.0 - 100.0,
+        )
+
+    @njit(SENTINUM_HEADER_SIGNATURE, cache=True, boundscheck=False)
+    def _juno_unpack(b):
+        """Juno Header Kernel (Bytes 0-5, Temperatur 8 Bit mit -128°C Offset)."""
+        return (
+            float(b[0] >> 4),
+            float(b[0] & 0x0F),
+            float(b[1] >> 4),
+            float(b[1] & 0x0F),
+            float(b[2]),
+            ((int(b[3]) << 8) | int(b[4])) / 1000.0,
+            float(int(b[5]) - 128),
+        )
+else:
+    # Ohne Numba: Header mit einem vorkompilierten struct lesen statt Byte für Byte zu schieben
+    def _febris_unpack(b):
+        """Febris Header Kernel (Bytes 0-6, Temperatur 16 Bit mit 0.1°C und -100°C Offset)."""
+        b0, b1, up_cnt, battery, temperature = _FEBRIS_HEADER.unpack_from(b)
+        return (float(b0 >> 4), float(b0 & 0x0F), float(b1 >> 4), float(b1 & 0x0F),
+                float(up_cnt), battery / 1000.0, temperature / 10.0 - 100.0)
+
+    def _juno_unpack(b):
+        """Juno Header Kernel (Bytes 0-5, Temperatur 8 Bit mit -128°C Offset)."""
+        b0, b1, up_cnt, battery, temperature = _JUNO_HEADER.unpack_from(b)
+        return (float(b0 >> 4), float(b0 & 0x0F), float(b1 >> 4), float(b1 & 0x0F),
+                float(up_cnt), battery / 1000.0, float(temperature - 128))
+
+
+def _unpack_sentinum_header(kernel, payload_bytes: bytes, min_length: int) -> tuple:
+    """Führe Header-Kernel aus (JIT-kompiliert falls Numba verfügbar)."""
+    if len(payload_bytes) < min_length:
+        raise IndexError(f"Payload zu kurz für Sentinum Header ({len(payload_bytes)} < {min_length} Bytes)")
+    if NUMBA_AVAILABLE:
+        if isinstance(payload_bytes, (bytes, bytearray, memoryview)):
+            return kernel(np.frombuffer(payload_bytes, dtype=np.uint8))
+        return kernel(np.asarray(payload_bytes, dtype=np.uint8))
+    return kernel(payload_bytes)
+
+
+def _unpack_febris_words(payload_bytes: bytes) -> tuple:
+    """Dekodiere Batterie, Innentemperatur und Feuchte (Bytes 3-8) in einem Schritt."""
+    if NUMPY_AVAILABLE:
+        words = np.frombuffer(payload_bytes, dtype='>u2', count=len(FEBRIS_WORD_DIVISORS), offset=FEBRIS_WORD_OFFSET)
+        return tuple((words / _FEBRIS_WORD_DIVISORS_NP + _FEBRIS_WORD_OFFSETS_NP).tolist())
+    words = _FEBRIS_WORDS.unpack_from(payload_bytes, FEBRIS_WORD_OFFSET)
+    return tuple(w / d + o for w, d, o in zip(words, FEBRIS_WORD_DIVISORS, FEBRIS_WORD_OFFSETS))
+
+
+def payload_hex(payload_bytes: Any) -> Optional[str]:
+    """raw_data für Dekodier-Ergebnisse: Payload als Hex-String, None wenn keine Bytes daraus werden."""
+    try:
+        return (payload_bytes if type(payload_bytes) is bytes else bytes(payload_bytes)).hex()
+    except (TypeError, ValueError):
+        return None
+
+
+def _flatten_formatted_data(data: Any) -> Any:
+    """Reduziere {'value', 'unit', 'description'} Einträge auf den reinen Wert."""
+    if not isinstance(data, dict):
+        return data
+    return {key: entry['value'] if isinstance(entry, dict) and 'value' in entry else entry
+            for key, entry in data.items()}
+
+
+def _format_schema_fields(decoded: Dict[str, Any], schema: tuple, verbose: bool = True) -> Dict[str, Any]:
+    """Baue formatted_data aus dekodierten Rohwerten anhand eines Ausgabe-Schemas.
+    
+    Mit verbose=False nur Feld -> Wert (Einheit/Beschreibung stehen in PayloadDecoder.OUTPUT_SCHEMAS).
+    """
+    if not verbose:
+        return {key: decoded[key] if ndigits is None else round(decoded[key], ndigits)
+                for key, _, _, ndigits in schema if key in decoded}
+    return {key: {'value': decoded[key] if ndigits is None else round(decoded[key], ndigits),
+                  'unit': unit,
+                  'description': description}
+            for key, unit, description, ndigits in schema if key in decoded}
+
+
+# Registry-Schreibvorgänge werden gebündelt und verzögert ausgeführt
+REGISTRY_SAVE_DELAY = 1.0  # Sekunden
+REGISTRY_FILE_NAME = "decoder_registry.json"
+# Sensor-Zuweisungen als Journal (eine JSON-Zeile pro Änderung), Snapshot erst nach N Einträgen
+REGISTRY_JOURNAL_NAME = "decoder_registry.journal"
+REGISTRY_COMPACT_OPS = 100
+
+# SHA-256 der mitgelieferten JS Decoder (decoders/), die in Python nachgebildet sind.
+# febris_universal.js fehlt bewusst: _decode_febris_python liefert andere Werte und Felder
+# als der JS Decoder, deshalb läuft er weiter über Node.js.
+JUNO_TH_JS_SHA256 = 'ea52a3491b3f7203b4e84223e2e90901758b30b43fb287e92bc85a0db6678696'
+
+# Persistenter Node.js Worker: eine JSON-Anfrage pro Zeile auf stdin, eine Antwort pro Zeile auf stdout
+NODE_TIMEOUT = 5  # Sekunden pro Dekodierung
+NODE_KILL_WAIT = 1  # Sekunden, die nach kill() auf das Prozessende gewartet wird
+NODE_WORKER_COUNT = min(8, os.cpu_count() or 1)  # Worker-Slots für parallele Dekodierungen
+NODE_WORKER_JS = """
+const fs = require('fs');
+const readline = require('readline');
+const decoders = new Map();
+
+// Decoder-Ausgaben dürfen das Antwortprotokoll auf stdout nicht stören
+console.log = console.info = console.debug = (...args) => process.stderr.write(args.join(' ') + '\\n');
+
+function loadDecoder(file) {
+    const mtime = fs.statSync(file).mtimeMs;
+    const cached = decoders.get(file);
+    if (cached && cached.mtime === mtime) {
+        return cached.decoder;
+    }
+    delete require.cache[require.resolve(file)];
+    const decoder = require(file);
+    decoders.set(file, { mtime: mtime, decoder: decoder });
+    return decoder;
+}
+
+// Anfrage {f, p, m} (p = Base64) -> Antwort {ok, data} bzw. {ok: false, error}
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+    let reply;
+    try {
+        const request = JSON.parse(line);
+        const decoder = loadDecoder(request.f);
+        // Payload kommt Base64-kodiert, Decoder erwarten ein Byte-Array
+        const payload = Array.from(Buffer.from(request.p, 'base64'));
+        let result;
+        if (typeof decoder.decode === 'function') {
+            result = decoder.decode(payload, request.m);
+        } else if (typeof decoder === 'function') {
+            result = decoder(payload, request.m);
+        } else {
+            throw new Error('No decode function found');
+        }
+        reply = JSON.stringify({ ok: true, data: result });
+    } catch (error) {
+        reply = JSON.stringify({ ok: false, error: String(error && error.message) });
+    }
+    process.stdout.write(reply + '\\n');
+}).on('close', () => process.exit(0));
+"""
+
+
+class _DecoderDirectoryHandler(FileSystemEventHandler):
+    """Leite Dateiereignisse im Decoder-Verzeichnis an den PayloadDecoder weiter."""
+    
+    def __init__(self, payload_decoder: 'PayloadDecoder'):
+        super().__init__()
+        self._payload_decoder = payload_decoder
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self._payload_decoder._register_decoder_file(event.src_path)
+    
+    on_modified = on_created
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._payload_decoder._forget_decoder_file(event.src_path)
+            self._payload_decoder._register_decoder_file(event.dest_path)
+    
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._payload_decoder._forget_decoder_file(event.src_path)
+
 
 class PayloadDecoder:
     """Payload Decoder Engine für verschiedene Decoder-Formate."""
     
+    # Metadaten-Kommentare in JS Decodern: // @name, // @version, // @description
+    _JS_META_RE = re.compile(r'//\s*@(name|version|description)\s+(.+)')
+    
+    # Exakte Sensor-Signaturen: (Payload-Länge, erstes Byte) -> Sensor-Typ
+    _SENSOR_TYPE_TABLE = {
+        (17, 0x11): 'FEBR-Environmental',
+    }
+    
+    # Ausgabe-Schemas je decoder_type (Einheiten/Beschreibungen für verbose=False Ergebnisse)
+    OUTPUT_SCHEMAS = {
+        'febris_python': FEBRIS_PYTHON_SCHEMA,
+        'juno_python': JUNO_PYTHON_SCHEMA,
+        'sentinum_juno': JUNO_PYTHON_SCHEMA,
+        'sentinum_febris': FEBRIS_SENTINUM_SCHEMA,
+        'iolink_adapter': IOLINK_ADAPTER_SCHEMA,
+        'sentinum_generic': GENERIC_SENTINUM_SCHEMA,
+    }
+    
     def __init__(self, decoder_dir: str = "/data/decoders"):
         """Initialisiere Payload Decoder."""
         self.decoder_dir = Path(decoder_dir)
@@ -26,76 +428,311 @@ class PayloadDecoder:
         # Decoder Registry
         self.decoders = {}  # sensor_eui -> decoder_info
         self.decoder_files = {}  # decoder_name -> file_info
+        self._by_decoder = defaultdict(set)  # decoder_name -> {sensor_eui} (invertierter Index)
         
         # IO-Link spezifische Datenstrukturen
         self.sensor_data_cache = {}  # sensor_eui -> sensor_data
         self.iolink_assignments = {}  # sensor_eui -> iolink_assignment_info
         
+        # Verzögertes, atomares Speichern der Registry
+        self._registry_lock = threading.Lock()
+        self._registry_dirty = False
+        self._save_timer = None
+        self._journal = None
+        self._journal_ops = 0  # Journal-Einträge seit dem letzten Snapshot
+        
+        # decoder_files und _resolved_decoders werden auch vom Watchdog-Thread geändert.
+        # Reihenfolge: _registry_lock vor _files_lock; unter _files_lock nie speichern.
+        self._files_lock = threading.Lock()
+        
+        # Geparste Blueprints (nicht Teil der Registry-Datei)
+        self._resolved_decoders = {}  # sensor_eui -> (Zuweisung, Decoder-Info, Engine, Methode)
+        self._blueprint_cache = {}  # file_path -> (mtime, blueprint, fields, layout, fast_decode)
+        self._blueprint_decoders = {}  # fields -> generierte Dekodierfunktion (identische Schemas teilen sie)
+        
+        # Persistente Node.js Worker für JavaScript Decoder (Start bei Bedarf, Round-Robin)
+        self._node_procs = [None] * NODE_WORKER_COUNT
+        self._node_locks = [threading.Lock() for _ in range(NODE_WORKER_COUNT)]
+        self._node_slot_counter = itertools.count()
+        
+        # Dispatch-Tabellen: Decoder-Typ bzw. JS-Engine -> Dekodiermethode
+        self._type_dispatch = {
+            'blueprint': self._decode_with_blueprint,
+            'javascript': self._decode_with_javascript,
+            'iodd': self._decode_with_iodd,
+        }
+        self._engine_dispatch = {
+            'juno': self._decode_juno_sentinum,
+            'febris': self._decode_febris_sentinum,
+        }
+        # Erkannter Sensor-Typ -> Sentinum Decoder (alle übrigen Typen: generischer Decoder)
+        self._sensor_type_dispatch = {
+            'IO-Link-Adapter': self._decode_iolink_adapter,
+            'FEBR-Environmental': self._decode_febris_sentinum,
+        }
+        # Python-Engines, die eine Sensor-Zuweisung direkt verwendet (ohne Node.js)
+        self._python_engines = {
+            'juno_python': self._decode_juno_python,
+        }
+        # Bekannte JS Decoder (Inhalts-Hash) -> Python-Engine
+        self._known_js_engines = {
+            JUNO_TH_JS_SHA256: 'juno_python',
+        }
+        
         self.load_decoders()
-        logging.info("Payload Decoder Engine initialisiert")
+        
+        # Verzeichnis-Überwachung: neue Dateien ohne erneuten Scan erkennen
+        self._observer = None
+        if WATCHDOG_AVAILABLE:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_DecoderDirectoryHandler(self), str(self.decoder_dir), recursive=False)
+                self._observer.start()
+            except OSError as e:
+                _logger.warning("Decoder-Verzeichnis kann nicht überwacht werden: %s", e)
+                self._observer = None
+        _logger.info("Payload Decoder Engine initialisiert")
     
     def load_decoders(self):
         """Lade alle verfügbaren Decoder."""
         try:
             # Lade Decoder-Registry
-            registry_file = self.decoder_dir / "decoder_registry.json"
-            if registry_file.exists():
-                with open(registry_file, 'r') as f:
-                    data = json.load(f)
-                    self.decoders = data.get('sensor_decoders', {})
-                    self.decoder_files = data.get('decoder_files', {})
+            registry_file = self.decoder_dir / REGISTRY_FILE_NAME
+            with self._files_lock:
+                if registry_file.exists():
+                    with open(registry_file, 'rb') as f:
+                        data = json_compat.loads(f.read())
+                        self.decoders = data.get('sensor_decoders', {})
+                        self.decoder_files = data.get('decoder_files', {})
+                
+                # Scanne Decoder-Verzeichnis
+                self._scan_decoder_directory()
+                
+                # Zuweisungsänderungen seit dem letzten Snapshot nachspielen
+                self._replay_journal()
+                self._resolved_decoders.clear()
             
-            # Scanne Decoder-Verzeichnis
-            self._scan_decoder_directory()
+            self._by_decoder.clear()
+            for sensor_eui, assignment in self.decoders.items():
+                self._by_decoder[assignment.get('decoder_name')].add(sensor_eui)
             
         except Exception as e:
-            logging.error(f"Fehler beim Laden der Decoder: {e}")
+            _logger.error("Fehler beim Laden der Decoder: %s", e)
+    
+    def _replay_journal(self):
+        """Wende die Einträge des Zuweisungs-Journals auf die geladene Registry an."""
+        self._journal_ops = 0
+        journal_file = self.decoder_dir / REGISTRY_JOURNAL_NAME
+        if not journal_file.exists():
+            return
+        
+        with open(journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json_compat.loads(line)
+                except ValueError:
+                    # Beim Absturz abgeschnittene Zeile überspringen
+                    continue
+                if entry.get('op') == 'assign':
+                    # Zuweisungen zu inzwischen gelöschten Decodern nicht wiederherstellen
+                    if entry['a'].get('decoder_name') in self.decoder_files:
+                        self.decoders[entry['eui']] = entry['a']
+                elif entry.get('op') == 'remove':
+                    self.decoders.pop(entry['eui'], None)
+                self._journal_ops += 1
+    
+    def _journal_assignment(self, sensor_eui: str, assignment: Optional[Dict[str, Any]]) -> bool:
+        """Hänge eine Zuweisungsänderung an das Journal an (assignment None = Zuweisung entfernt).
+        
+        Statt die komplette Registry pro Änderung neu zu schreiben, wird erst nach
+        REGISTRY_COMPACT_OPS Einträgen ein Snapshot geplant (der das Journal leert).
+        """
+        if assignment is None:
+            entry = {'op': 'remove', 'eui': sensor_eui}
+        else:
+            entry = {'op': 'assign', 'eui': sensor_eui, 'a': assignment}
+        
+        with self._registry_lock:
+            try:
+                if self._journal is None:
+                    self._journal = open(self.decoder_dir / REGISTRY_JOURNAL_NAME, 'a', encoding='utf-8')
+                self._journal.write(json_compat.dumps_str(entry) + '\n')
+                self._journal.flush()
+                self._journal_ops += 1
+                compact = self._journal_ops >= REGISTRY_COMPACT_OPS
+            except OSError as e:
+                _logger.error("Fehler beim Schreiben des Registry-Journals: %s", e)
+                compact = True
+        
+        return self.save_decoders() if compact else True
     
     def save_decoders(self):
-        """Speichere Decoder-Registry."""
-        try:
-            registry_file = self.decoder_dir / "decoder_registry.json"
-            with open(registry_file, 'w') as f:
-                json.dump({
-                    'sensor_decoders': self.decoders,
-                    'decoder_files': self.decoder_files
-                }, f, indent=2)
-            return True
-        except Exception as e:
-            logging.error(f"Fehler beim Speichern der Decoder-Registry: {e}")
-            return False
+        """Markiere Decoder-Registry als geändert und plane das Speichern."""
+        with self._registry_lock:
+            self._registry_dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(REGISTRY_SAVE_DELAY, self.flush_decoders)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+        return True
+    
+    def flush_decoders(self) -> bool:
+        """Schreibe geänderte Decoder-Registry sofort und atomar (tmp-Datei + os.replace)."""
+        with self._registry_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._registry_dirty and not self._journal_ops:
+                return True
+            
+            try:
+                registry_file = self.decoder_dir / REGISTRY_FILE_NAME
+                tmp_file = registry_file.with_suffix('.json.tmp')
+                with self._files_lock:
+                    snapshot = json_compat.dumps_indent({
+                        'sensor_decoders': self.decoders,
+                        'decoder_files': self.decoder_files
+                    })
+                with open(tmp_file, 'wb') as f:
+                    f.write(snapshot)
+                    # Snapshot vor dem Umbenennen auf die Platte bringen: nach einem Stromausfall
+                    # ist die Registry entweder alt oder neu, aber nie leer (Journal bleibt bis dahin)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, registry_file)
+                self._registry_dirty = False
+                
+                # Snapshot enthält alle Zuweisungen - Journal leeren
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                (self.decoder_dir / REGISTRY_JOURNAL_NAME).unlink(missing_ok=True)
+                self._journal_ops = 0
+                return True
+            except Exception as e:
+                _logger.error("Fehler beim Speichern der Decoder-Registry: %s", e)
+                return False
+    
+    def shutdown(self):
+        """Offene Registry-Änderungen schreiben, Verzeichnisüberwachung und Node.js Worker beenden."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        self.flush_decoders()
+        
+        for slot, lock in enumerate(self._node_locks):
+            with lock:
+                proc = self._node_procs[slot]
+                if proc is None:
+                    continue
+                if proc.poll() is None:
+                    # stdin schließen beendet den Worker regulär
+                    proc.stdin.close()
+                    try:
+                        proc.wait(timeout=NODE_TIMEOUT)
+                    except subprocess.TimeoutExpired:
+                        pass
+                self._kill_node_worker(proc)
+                self._node_procs[slot] = None
     
     def _scan_decoder_directory(self):
-        """Scanne Decoder-Verzeichnis nach neuen Dateien."""
-        for file_path in self.decoder_dir.glob("*"):
-            if file_path.is_file() and file_path.suffix in ['.js', '.json', '.xml']:
-                decoder_name = file_path.stem
-                if decoder_name not in self.decoder_files:
-                    # Neuer Decoder gefunden, analysiere ihn
-                    decoder_info = self._analyze_decoder_file(file_path)
-                    if decoder_info:
-                        self.decoder_files[decoder_name] = decoder_info
+        """Scanne Decoder-Verzeichnis nach neuen Dateien (Analyse erst bei Bedarf, Aufruf unter _files_lock)."""
+        # scandir liefert Name und Dateityp ohne zusätzlichen stat() pro Eintrag
+        with os.scandir(self.decoder_dir) as entries:
+            for entry in entries:
+                decoder_name, suffix = os.path.splitext(entry.name)
+                if suffix not in DECODER_SUFFIX_TYPES or decoder_name in self.decoder_files:
+                    continue
+                if entry.is_file():
+                    # Neuer Decoder gefunden, nur leichtgewichtigen Eintrag anlegen
+                    self.decoder_files[decoder_name] = {
+                        'type': DECODER_SUFFIX_TYPES[suffix],
+                        'file_path': entry.path,
+                        'created_at': entry.stat().st_mtime,
+                        'lazy': True
+                    }
+    
+    def _register_decoder_file(self, path: str):
+        """Trage eine neue oder geänderte Decoder-Datei ein (Analyse erst bei Bedarf)."""
+        file_name = os.path.basename(path)
+        decoder_name, suffix = os.path.splitext(file_name)
+        if suffix not in DECODER_SUFFIX_TYPES or file_name == REGISTRY_FILE_NAME:
+            return
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+        
+        with self._files_lock:
+            decoder_info = self.decoder_files.get(decoder_name)
+            if decoder_info is not None and decoder_info.get('created_at') == mtime:
+                # Bereits mit diesem Stand analysiert (z.B. über upload_decoder)
+                return
+            self.decoder_files[decoder_name] = {
+                'type': DECODER_SUFFIX_TYPES[suffix],
+                'file_path': str(self.decoder_dir / file_name),
+                'created_at': mtime,
+                'lazy': True
+            }
+            self._resolved_decoders.clear()
+    
+    def _forget_decoder_file(self, path: str):
+        """Entferne einen Decoder, dessen Datei gelöscht oder umbenannt wurde."""
+        file_name = os.path.basename(path)
+        decoder_name = os.path.splitext(file_name)[0]
+        with self._files_lock:
+            decoder_info = self.decoder_files.get(decoder_name)
+            if (decoder_info is None or os.path.basename(decoder_info['file_path']) != file_name
+                    or os.path.exists(path)):
+                return
+            self.decoder_files.pop(decoder_name, None)
+            self._resolved_decoders.clear()
+        self.save_decoders()
+    
+    def _ensure_analyzed(self, decoder_name: str) -> Optional[Dict[str, Any]]:
+        """Analysiere einen beim Scan nur vorgemerkten Decoder beim ersten Zugriff."""
+        with self._files_lock:
+            decoder_info = self.decoder_files.get(decoder_name)
+            if decoder_info is None or not decoder_info.get('lazy'):
+                return decoder_info
+            
+            decoder_info = self._analyze_decoder_file(Path(decoder_info['file_path']))
+            self._resolved_decoders.clear()
+            if decoder_info:
+                self.decoder_files[decoder_name] = decoder_info
+            else:
+                # Datei fehlt oder ist ungültig - wie beim bisherigen Scan nicht registrieren
+                self.decoder_files.pop(decoder_name, None)
+        self.save_decoders()
+        return decoder_info
     
-    def _analyze_decoder_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
-        """Analysiere Decoder-Datei und extrahiere Metadaten."""
+    def _analyze_decoder_file(self, file_path: Path,
+                              preloaded_content: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """Analysiere Decoder-Datei und extrahiere Metadaten (optional aus bereits geladenem Inhalt)."""
         try:
             if file_path.suffix == '.json':
                 # mioty Blueprint Decoder
-                return self._analyze_blueprint_decoder(file_path)
+                return self._analyze_blueprint_decoder(file_path, preloaded_content)
             elif file_path.suffix == '.js':
                 # Sentinum JavaScript Decoder
-                return self._analyze_js_decoder(file_path)
+                return self._analyze_js_decoder(file_path, preloaded_content)
             elif file_path.suffix == '.xml':
                 # IODD (IO Device Description) Decoder
                 return self._analyze_iodd_decoder(file_path)
         except Exception as e:
-            logging.error(f"Fehler beim Analysieren der Decoder-Datei {file_path}: {e}")
+            _logger.error("Fehler beim Analysieren der Decoder-Datei %s: %s", file_path, e)
         return None
     
-    def _analyze_blueprint_decoder(self, file_path: Path) -> Dict[str, Any]:
+    def _analyze_blueprint_decoder(self, file_path: Path,
+                                   preloaded_content: Optional[bytes] = None) -> Dict[str, Any]:
         """Analysiere mioty Blueprint Decoder."""
-        with open(file_path, 'r') as f:
-            blueprint = json.load(f)
+        if preloaded_content is not None:
+            blueprint = json_compat.loads(preloaded_content)
+        else:
+            with open(file_path, 'rb') as f:
+                blueprint = json_compat.loads(f.read())
+        mtime = file_path.stat().st_mtime
+        self._cache_blueprint(str(file_path), blueprint, mtime)
         
         return {
             'type': 'blueprint',
@@ -105,29 +742,90 @@ class PayloadDecoder:
             'description': blueprint.get('description', 'mioty Blueprint Decoder'),
             'supported_devices': blueprint.get('devices', []),
             'payload_format': blueprint.get('payload', {}),
-            'created_at': file_path.stat().st_mtime
+            'created_at': mtime
         }
     
-    def _analyze_js_decoder(self, file_path: Path) -> Dict[str, Any]:
+    def _cache_blueprint(self, file_path: str, blueprint: Dict[str, Any], mtime: float) -> tuple:
+        """Lege geparsten Blueprint samt vorberechneter Feldliste im Cache ab."""
+        fields = tuple(
+            (field_name,
+             field_config.get('type', 'uint8'),
+             field_config.get('length', 1),
+             field_config.get('scale', 1.0),
+             field_config.get('offset', 0.0),
+             field_config.get('unit', ''),
+             field_config.get('description', field_name))
+            for field_name, field_config in blueprint.get('payload', {}).items()
+        )
+        
+        # Nur feste Feldtypen -> ein einziges vorkompiliertes struct für alle Felder
+        codes = [BLUEPRINT_STRUCT_CODES.get((field[1], field[2])) for field in fields]
+        layout = struct.Struct('>' + ''.join(codes)) if fields and all(codes) else None
+        fast_decode = self._get_blueprint_decoder(fields, layout) if layout is not None else None
+        
+        entry = (mtime, blueprint, fields, layout, fast_decode)
+        self._blueprint_cache[file_path] = entry
+        return entry
+    
+    def _get_blueprint_decoder(self, fields: tuple, layout: struct.Struct):
+        """Hole generierte Dekodierfunktion für ein Schema, erzeuge sie nur einmal."""
+        try:
+            fast_decode = self._blueprint_decoders.get(fields)
+        except TypeError:
+            # Nicht hashbare Werte im Blueprint (z.B. Listen) - nicht cachen
+            return _compile_blueprint_decoder(fields, layout)
+        if fast_decode is None:
+            fast_decode = _compile_blueprint_decoder(fields, layout)
+            self._blueprint_decoders[fields] = fast_decode
+        return fast_decode
+    
+    def _get_blueprint(self, file_path: str) -> tuple:
+        """Hole Blueprint aus dem Cache, lade nur bei geänderter Datei neu."""
+        mtime = os.path.getmtime(file_path)
+        entry = self._blueprint_cache.get(file_path)
+        if entry is None or entry[0] != mtime:
+            with open(file_path, 'rb') as f:
+                blueprint = json_compat.loads(f.read())
+            entry = self._cache_blueprint(file_path, blueprint, mtime)
+        return entry
+    
+    def _analyze_js_decoder(self, file_path: Path,
+                            preloaded_content: Optional[bytes] = None) -> Dict[str, Any]:
         """Analysiere Sentinum JavaScript Decoder."""
-        with open(file_path, 'r') as f:
-            js_content = f.read()
+        if preloaded_content is not None:
+            raw_content = preloaded_content
+        else:
+            with open(file_path, 'rb') as f:
+                raw_content = f.read()
+        js_content = raw_content.decode('utf-8')
         
-        # Extrahiere Metadaten aus Kommentaren
-        name_match = re.search(r'//\s*@name\s+(.+)', js_content)
-        version_match = re.search(r'//\s*@version\s+(.+)', js_content)
-        desc_match = re.search(r'//\s*@description\s+(.+)', js_content)
+        # Extrahiere Metadaten aus Kommentaren (ein Durchlauf, erstes Vorkommen gewinnt)
+        meta = {}
+        for match in self._JS_META_RE.finditer(js_content):
+            meta.setdefault(match.group(1), match.group(2).strip())
         
         return {
             'type': 'javascript',
             'file_path': str(file_path),
-            'name': name_match.group(1) if name_match else file_path.stem,
-            'version': version_match.group(1) if version_match else '1.0',
-            'description': desc_match.group(1) if desc_match else 'Sentinum JavaScript Decoder',
+            'engine': self._detect_js_engine(js_content),
+            'content_hash': hashlib.sha256(raw_content).hexdigest(),
+            'name': meta.get('name', file_path.stem),
+            'version': meta.get('version', '1.0'),
+            'description': meta.get('description', 'Sentinum JavaScript Decoder'),
             'supported_devices': [],  # Kann aus JS Code extrahiert werden
             'created_at': file_path.stat().st_mtime
         }
     
+    @staticmethod
+    def _detect_js_engine(js_content: str) -> str:
+        """Bestimme die passende Sentinum Engine für einen JS Decoder (einmalig beim Analysieren)."""
+        content = js_content.lower()
+        if 'juno' in content:
+            return 'juno'
+        if 'febris' in content:
+            return 'febris'
+        return 'auto'
+    
     def _analyze_iodd_decoder(self, file_path: Path) -> Dict[str, Any]:
         """Analysiere IODD (IO Device Description) XML-Datei."""
         try:
@@ -155,7 +853,7 @@ class PayloadDecoder:
                     # Fallback ohne Namespace
                     device_identity = root.find('.//DeviceIdentity')
             except Exception as e:
-                logging.warning(f"DeviceIdentity Suche fehlgeschlagen: {e}")
+                _logger.warning("DeviceIdentity Suche fehlgeschlagen: %s", e)
                 device_identity = None
             
             if device_identity is not None:
@@ -191,11 +889,11 @@ class PayloadDecoder:
                     if device_info is not None and device_info.text:
                         device_name = device_info.text
                 except Exception as e:
-                    logging.warning(f"Fallback-Suche fehlgeschlagen: {e}")
+                    _logger.warning("Fallback-Suche fehlgeschlagen: %s", e)
             
             # Spezialbehandlung für ExternalTextDocument (nur Übersetzungen)
             if root.tag.endswith('ExternalTextDocument'):
-                logging.info("📋 ExternalTextDocument erkannt - extrahiere Informationen aus Dateinamen")
+                _logger.info("📋 ExternalTextDocument erkannt - extrahiere Informationen aus Dateinamen")
                 
                 # Extrahiere aus Dateinamen: ifm-000173-20160824-IODD1.0.1-de.xml
                 filename = file_path.name
@@ -222,9 +920,9 @@ class PayloadDecoder:
                                 device_name = f"ifm {text_value} Kapazitiver Sensor"
                                 break
                 except Exception as e:
-                    logging.warning(f"Text-Element Extraktion fehlgeschlagen: {e}")
+                    _logger.warning("Text-Element Extraktion fehlgeschlagen: %s", e)
             
-            logging.info(f"📋 IODD Analyse: VID={vendor_id}, DID={device_id}, Vendor='{vendor_name}', Device='{device_name}'")
+            _logger.info("📋 IODD Analyse: VID=%s, DID=%s, Vendor='%s', Device='%s'", vendor_id, device_id, vendor_name, device_name)
             
             # Extrahiere ProcessDataIn für Payload-Format (mit Namespace-sicherer Suche)
             process_data_in = None
@@ -279,7 +977,7 @@ class PayloadDecoder:
             }
             
         except ET.ParseError as e:
-            logging.error(f"XML-Parser-Fehler in IODD-Datei {file_path}: {e}")
+            _logger.error("XML-Parser-Fehler in IODD-Datei %s: %s", file_path, e)
             # Fallback für ungültige XML-Dateien
             return {
                 'type': 'iodd',
@@ -302,155 +1000,182 @@ class PayloadDecoder:
         """Lade neue Decoder-Datei hoch."""
         try:
             file_path = self.decoder_dir / filename
+            raw_content = content if isinstance(content, bytes) else str(content).encode('utf-8')
             
-            # Schreibe Datei
-            if isinstance(content, bytes):
-                with open(file_path, 'wb') as f:
-                    f.write(content)
-            else:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(str(content))
+            # Schreibe Datei atomar: der Scanner sieht nie eine halb geschriebene Datei
+            part_path = self.decoder_dir / (filename + '.part')
+            with open(part_path, 'wb') as f:
+                f.write(raw_content)
+            os.replace(part_path, file_path)
             
-            # Analysiere neue Datei
-            decoder_info = self._analyze_decoder_file(file_path)
+            # Analysiere neue Datei aus dem Speicher (kein erneutes Lesen)
+            decoder_info = self._analyze_decoder_file(file_path, raw_content)
             if decoder_info:
-                self.decoder_files[file_path.stem] = decoder_info
+                with self._files_lock:
+                    self.decoder_files[file_path.stem] = decoder_info
+                    self._resolved_decoders.clear()
+                # Geänderter Inhalt: Engine der bestehenden Zuweisungen neu auflösen
+                engine = self._resolve_engine(decoder_info)
+                for sensor_eui in self._by_decoder.get(file_path.stem, ()):
+                    self.decoders[sensor_eui]['engine'] = engine
                 self.save_decoders()
-                logging.info(f"Decoder {filename} erfolgreich hochgeladen")
+                _logger.info("Decoder %s erfolgreich hochgeladen", filename)
                 return True
             else:
-                logging.error(f"Decoder-Analyse fehlgeschlagen für {filename}")
+                _logger.error("Decoder-Analyse fehlgeschlagen für %s", filename)
                 return False
             
         except Exception as e:
-            logging.error(f"Fehler beim Hochladen des Decoders {filename}: {e}")
+            _logger.error("Fehler beim Hochladen des Decoders %s: %s", filename, e)
             return False
     
     def assign_decoder(self, sensor_eui: str, decoder_name: str) -> bool:
         """Weise Decoder einem Sensor zu."""
-        if decoder_name not in self.decoder_files:
-            logging.error(f"Decoder {decoder_name} nicht gefunden")
+        decoder_info = self._ensure_analyzed(decoder_name)
+        if decoder_info is None:
+            _logger.error("Decoder %s nicht gefunden", decoder_name)
             return False
         
+        self._unindex_assignment(sensor_eui)
         self.decoders[sensor_eui] = {
             'decoder_name': decoder_name,
-            'assigned_at': time.time()
+            'engine': self._resolve_engine(decoder_info),
+            'assigned_at': _now()
         }
+        self._by_decoder[decoder_name].add(sensor_eui)
+        
+        return self._journal_assignment(sensor_eui, self.decoders[sensor_eui])
+    
+    def _lookup_decoder(self, sensor_eui: str, decoder_assignment: Dict[str, Any]) -> Optional[tuple]:
+        """Hole (Zuweisung, Decoder-Info, Python-Engine, Dekodiermethode) für einen Sensor.
+        
+        Das Ergebnis wird pro Sensor gemerkt und gilt, solange dieselbe Zuweisung besteht;
+        Änderungen an den Decoder-Dateien leeren den Cache.
+        """
+        resolved = self._resolved_decoders.get(sensor_eui)
+        if resolved is not None and resolved[0] is decoder_assignment:
+            return resolved
+        
+        decoder_info = self._ensure_analyzed(decoder_assignment['decoder_name'])
+        if decoder_info is None:
+            return None
+        if 'engine' not in decoder_assignment:
+            # Zuweisungen aus älteren Registry-Dateien einmalig nachziehen
+            decoder_assignment['engine'] = self._resolve_engine(decoder_info)
         
-        return self.save_decoders()
+        resolved = (decoder_assignment, decoder_info,
+                    self._python_engines.get(decoder_assignment['engine']),
+                    self._type_dispatch.get(decoder_info['type']))
+        with self._files_lock:
+            # Nur merken, wenn der Watchdog die Decoder-Datei nicht inzwischen ersetzt hat
+            if self.decoder_files.get(decoder_assignment['decoder_name']) is decoder_info:
+                self._resolved_decoders[sensor_eui] = resolved
+        return resolved
+    
+    def _resolve_engine(self, decoder_info: Dict[str, Any]) -> Optional[str]:
+        """Bestimme einmalig die Python-Engine für einen Decoder (None = regulärer Decoder-Typ)."""
+        return self._known_js_engines.get(decoder_info.get('content_hash'))
+    
+    def _unindex_assignment(self, sensor_eui: str):
+        """Entferne bestehende Zuweisung eines Sensors aus dem invertierten Index."""
+        assignment = self.decoders.get(sensor_eui)
+        if assignment is not None:
+            euis = self._by_decoder.get(assignment.get('decoder_name'))
+            if euis is not None:
+                euis.discard(sensor_eui)
+                if not euis:
+                    del self._by_decoder[assignment.get('decoder_name')]
     
     def remove_decoder_assignment(self, sensor_eui: str) -> bool:
         """Entferne Decoder-Zuweisung für Sensor."""
         if sensor_eui in self.decoders:
+            self._unindex_assignment(sensor_eui)
             del self.decoders[sensor_eui]
-            return self.save_decoders()
+            self._resolved_decoders.pop(sensor_eui, None)
+            return self._journal_assignment(sensor_eui, None)
         return True
     
-    def decode_payload(self, sensor_eui: str, payload_bytes: List[int], 
-                      metadata: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Dekodiere Payload für spezifischen Sensor."""
-        logging.info(f"🔍 DECODE_PAYLOAD AUFGERUFEN für {sensor_eui}")
-        logging.info(f"   📋 Verfügbare Decoder-Zuweisungen: {list(self.decoders.keys())}")
-        logging.info(f"   📋 Verfügbare Decoder-Dateien: {list(self.decoder_files.keys())}")
+    def decode_payload(self, sensor_eui: str, payload_bytes: Union[List[int], bytes], 
+                      metadata: Dict[str, Any] = None, verbose: bool = True) -> Dict[str, Any]:
+        """Dekodiere Payload für spezifischen Sensor.
         
-        if sensor_eui not in self.decoders:
-            logging.warning(f"❌ Kein Decoder für {sensor_eui} zugewiesen - versuche generische Dekodierung")
-            # Fallback: Generische Sentinum Dekodierung versuchen
-            return self._decode_generic_sentinum(payload_bytes, metadata or {}, "mioty")
+        Mit verbose=False enthält 'data' nur Feld -> Wert statt {'value', 'unit', 'description'}.
+        """
+        _logger.info("🔍 DECODE_PAYLOAD AUFGERUFEN für %s", sensor_eui)
+        if _logger.isEnabledFor(logging.INFO):
+            _logger.info("   📋 Verfügbare Decoder-Zuweisungen: %s", list(self.decoders.keys()))
+            _logger.info("   📋 Verfügbare Decoder-Dateien: %s", list(self.decoder_files.keys()))
         
-        logging.info(f"✅ Decoder für {sensor_eui} gefunden: {self.decoders[sensor_eui]}")
-        
-        if sensor_eui not in self.decoders:
+        # Einmalige Konvertierung an der API-Grenze: Decoder arbeiten intern auf bytes
+        try:
+            buf = payload_bytes if type(payload_bytes) is bytes else bytes(payload_bytes)
+        except (TypeError, ValueError) as e:
             return {
                 'decoded': False,
-                'reason': 'No decoder assigned',
-                'raw_data': payload_bytes
+                'reason': f'Invalid payload: {str(e)}',
+                'raw_data': None
             }
         
-        decoder_assignment = self.decoders[sensor_eui]
-        decoder_name = decoder_assignment['decoder_name']
+        # raw_data im Ergebnis als ein Hex-String statt Liste von Ints (günstig zu serialisieren)
+        raw_hex = buf.hex()
+        
+        decoder_assignment = self.decoders.get(sensor_eui)
+        if decoder_assignment is None:
+            _logger.warning("❌ Kein Decoder für %s zugewiesen - versuche generische Dekodierung", sensor_eui)
+            # Fallback: Generische Sentinum Dekodierung versuchen
+            result = self._decode_generic_sentinum(buf, metadata or {}, "mioty", verbose)
+            result['raw_data'] = raw_hex
+            return result
+        
+        _logger.info("✅ Decoder für %s gefunden: %s", sensor_eui, decoder_assignment)
         
-        if decoder_name not in self.decoder_files:
+        resolved = self._lookup_decoder(sensor_eui, decoder_assignment)
+        if resolved is None:
             return {
                 'decoded': False,
                 'reason': 'Decoder file not found',
-                'raw_data': payload_bytes
+                'raw_data': raw_hex
             }
-        
-        decoder_info = self.decoder_files[decoder_name]
+        _, decoder_info, engine_method, decode_method = resolved
         
         try:
-            if decoder_info['type'] == 'blueprint':
-                return self._decode_with_blueprint(decoder_info, payload_bytes, metadata)
-            elif decoder_info['type'] == 'javascript':
-                return self._decode_with_javascript(decoder_info, payload_bytes, metadata)
-            elif decoder_info['type'] == 'iodd':
-                return self._decode_with_iodd(decoder_info, payload_bytes, metadata)
-            else:
+            # Bei der Zuweisung aufgelöste Python-Engine: direkter Aufruf ohne Decoder-Datei
+            if engine_method is not None:
+                result = engine_method(buf, metadata or {}, verbose=verbose)
+                result['raw_data'] = raw_hex
+                return result
+            
+            if decode_method is None:
                 return {
                     'decoded': False,
                     'reason': f'Unsupported decoder type: {decoder_info["type"]}',
-                    'raw_data': payload_bytes
+                    'raw_data': raw_hex
                 }
+            result = decode_method(decoder_info, buf, metadata)
+            if not verbose and 'data' in result:
+                result['data'] = _flatten_formatted_data(result['data'])
+            result['raw_data'] = raw_hex
+            return result
         except Exception as e:
-            logging.error(f"Fehler beim Dekodieren für Sensor {sensor_eui}: {e}")
+            _logger.error("Fehler beim Dekodieren für Sensor %s: %s", sensor_eui, e)
             return {
                 'decoded': False,
                 'reason': f'Decoding error: {str(e)}',
-                'raw_data': payload_bytes
+                'raw_data': raw_hex
             }
     
     def _decode_with_blueprint(self, decoder_info: Dict[str, Any], 
-                              payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
+                              payload_bytes: bytes, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Dekodiere mit mioty Blueprint."""
         try:
-            # Lade Blueprint
-            with open(decoder_info['file_path'], 'r') as f:
-                blueprint = json.load(f)
-            
-            payload_config = blueprint.get('payload', {})
-            decoded_data = {}
-            
-            # Einfache Blueprint-Interpretation
-            byte_index = 0
-            for field_name, field_config in payload_config.items():
-                if byte_index >= len(payload_bytes):
-                    break
-                
-                field_type = field_config.get('type', 'uint8')
-                field_length = field_config.get('length', 1)
-                
-                # Extrahiere Bytes für dieses Feld
-                field_bytes = payload_bytes[byte_index:byte_index + field_length]
-                
-                # Konvertiere basierend auf Typ
-                if field_type == 'uint8' and field_length == 1:
-                    value = field_bytes[0] if field_bytes else 0
-                elif field_type == 'uint16' and field_length == 2:
-                    value = (field_bytes[0] << 8 | field_bytes[1]) if len(field_bytes) == 2 else 0
-                elif field_type == 'float' and field_length == 4:
-                    # Vereinfachte Float-Interpretation
-                    import struct
-                    if len(field_bytes) == 4:
-                        value = struct.unpack('>f', bytes(field_bytes))[0]
-                    else:
-                        value = 0.0
-                else:
-                    value = field_bytes
-                
-                # Skalierung anwenden
-                scale = field_config.get('scale', 1.0)
-                offset = field_config.get('offset', 0.0)
-                if isinstance(value, (int, float)):
-                    value = value * scale + offset
-                
-                decoded_data[field_name] = {
-                    'value': value,
-                    'unit': field_config.get('unit', ''),
-                    'description': field_config.get('description', field_name)
-                }
-                
-                byte_index += field_length
+            # Lade Blueprint (gecacht)
+            _, _, fields, layout, fast_decode = self._get_blueprint(decoder_info['file_path'])
+            
+            # Fast Path: vollständiger Payload mit festem Layout -> generierte Funktion
+            if fast_decode is not None and len(payload_bytes) >= layout.size:
+                decoded_data = fast_decode(payload_bytes)
+            else:
+                decoded_data = self._decode_blueprint_fields(fields, payload_bytes)
             
             return {
                 'decoded': True,
@@ -463,121 +1188,228 @@ class PayloadDecoder:
         except Exception as e:
             raise Exception(f"Blueprint decoding error: {str(e)}")
     
+    def _decode_blueprint_fields(self, fields: tuple, payload_bytes: bytes) -> Dict[str, Any]:
+        """Feldweise Blueprint-Interpretation (variable Typen oder gekürzter Payload)."""
+        decoded_data = {}
+        byte_index = 0
+        payload_length = len(payload_bytes)
+        readers = BLUEPRINT_FIELD_READERS
+        for field_name, field_type, field_length, scale, offset, unit, description in fields:
+            if byte_index >= payload_length:
+                break
+            
+            # Konvertiere basierend auf Typ (Tabellen-Lookup, direkt aus dem Payload gelesen)
+            reader = readers.get((field_type, field_length))
+            if reader is None:
+                # Unbekannter Typ: Rohbytes ohne Skalierung
+                value = list(payload_bytes[byte_index:byte_index + field_length])
+            else:
+                unpack_from, missing = reader
+                if byte_index + field_length <= payload_length:
+                    value = unpack_from(payload_bytes, byte_index)[0] * scale + offset
+                else:
+                    value = missing * scale + offset
+            
+            decoded_data[field_name] = {
+                'value': value,
+                'unit': unit,
+                'description': description
+            }
+            
+            byte_index += field_length
+        
+        return decoded_data
+    
     def _decode_with_javascript(self, decoder_info: Dict[str, Any], 
-                               payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Dekodiere mit Sentinum JavaScript."""
+                               payload_bytes: bytes, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Dekodiere mit Sentinum JavaScript über den persistenten Node.js Worker."""
         try:
-            # Erstelle temporäre Node.js Umgebung
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                
-                # Kopiere Decoder-Datei
-                decoder_file = temp_path / "decoder.js"
-                with open(decoder_info['file_path'], 'r') as src:
-                    decoder_content = src.read()
-                
-                # Erstelle Wrapper für Node.js Ausführung
-                wrapper_content = f"""
-const decoder = require('./decoder.js');
-
-// Input-Daten
-const payload = {str(payload_bytes).replace('"', "'")};
-const metadata = {str(metadata or {}).replace('"', "'")};  
-
-try {{
-    // Führe Dekodierung aus
-    let result;
-    if (typeof decoder.decode === 'function') {{
-        result = decoder.decode(payload, metadata);
-    }} else if (typeof decoder === 'function') {{
-        result = decoder(payload, metadata);
-    }} else {{
-        throw new Error('No decode function found');
-    }}
+            try:
+                reply = self._node_worker_decode(decoder_info['file_path'], payload_bytes, metadata)
+            except FileNotFoundError:
+                # Node.js nicht verfügbar, verwende vereinfachte JS Interpretation
+                engine = decoder_info.get('engine')
+                if engine is None:
+                    # Einträge aus älteren Registry-Dateien: Engine einmalig bestimmen und merken
+                    with open(decoder_info['file_path'], 'r') as f:
+                        engine = decoder_info['engine'] = self._detect_js_engine(f.read())
+                    self.save_decoders()
+                return self._simple_js_decode(engine, payload_bytes, metadata)
+            except OSError as e:
+                # Worker abgestürzt - einmal mit neu gestartetem Worker wiederholen
+                _logger.warning("Node.js Worker abgestürzt (%s), starte neu", e)
+                try:
+                    reply = self._node_worker_decode(decoder_info['file_path'], payload_bytes, metadata)
+                except OSError as e:
+                    # Auch der neue Worker fällt aus - diese Dekodierung mit eigenem Node.js Prozess
+                    _logger.warning("Node.js Worker nicht verfügbar (%s), starte Einzelprozess", e)
+                    return self._decode_with_node_subprocess(decoder_info, payload_bytes, metadata)
+            
+            return self._javascript_result(decoder_info, reply, payload_bytes)
+            
+        except Exception as e:
+            raise Exception(f"JavaScript decoding error: {str(e)}")
     
-    console.log(JSON.stringify({{
-        decoded: true,
-        decoder_type: 'javascript',
-        decoder_name: '{decoder_info["name"]}',
-        data: result,
-        raw_data: payload
-    }}));
-}} catch (error) {{
-    console.log(JSON.stringify({{
-        decoded: false,
-        reason: 'JavaScript execution error: ' + error.message,
-        raw_data: payload
-    }}));
-}}
-"""
-                
-                # Schreibe Dateien
-                with open(decoder_file, 'w') as f:
-                    f.write(decoder_content)
+    @staticmethod
+    def _javascript_result(decoder_info: Dict[str, Any], reply: Dict[str, Any],
+                           payload_bytes: bytes) -> Dict[str, Any]:
+        """Baue das Dekodier-Ergebnis aus einer Antwort des Node.js Workers."""
+        if not reply.get('ok'):
+            return {
+                'decoded': False,
+                'reason': 'JavaScript execution error: ' + str(reply.get('error')),
+                'raw_data': payload_bytes
+            }
+        
+        return {
+            'decoded': True,
+            'decoder_type': 'javascript',
+            'decoder_name': decoder_info['name'],
+            'data': reply.get('data'),
+            'raw_data': payload_bytes
+        }
+    
+    def _node_worker_decode(self, file_path: str, payload_bytes: bytes,
+                            metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Sende eine Dekodier-Anfrage an den Node.js Worker und lies die Antwort."""
+        # Kompakte Anfrage: f = Decoder-Datei, p = Payload (Base64), m = Metadaten
+        return self._node_worker_request({
+            'f': os.path.abspath(file_path),
+            'p': base64.b64encode(payload_bytes).decode('ascii'),
+            'm': metadata or {}
+        })
+    
+    def _node_worker_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Schreibe eine Anfrage-Zeile an einen Node.js Worker (Round-Robin) und lies die Antwort."""
+        request_line = json_compat.dumps_str(request) + '\n'
+        
+        slot = next(self._node_slot_counter) % NODE_WORKER_COUNT
+        with self._node_locks[slot]:
+            proc = self._node_procs[slot]
+            if proc is None or proc.poll() is not None:
+                if proc is not None:
+                    # Beendeten Worker aufräumen (Pipes schließen), bevor er ersetzt wird
+                    self._kill_node_worker(proc)
+                proc = subprocess.Popen(
+                    ['node', '-e', NODE_WORKER_JS],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                    encoding='utf-8'
+                )
+                self._node_procs[slot] = proc
+                _logger.info("Node.js Decoder-Worker %s gestartet (PID %s)", slot, proc.pid)
+            
+            try:
+                proc.stdin.write(request_line)
+                proc.stdin.flush()
                 
-                wrapper_file = temp_path / "wrapper.js"
-                with open(wrapper_file, 'w') as f:
-                    f.write(wrapper_content)
+                ready, _, _ = select.select([proc.stdout], [], [], NODE_TIMEOUT)
+                if not ready:
+                    raise subprocess.TimeoutExpired('node', NODE_TIMEOUT)
                 
-                # Führe Node.js aus
-                try:
-                    result = subprocess.run(
-                        ['node', str(wrapper_file)],
-                        capture_output=True,
-                        text=True,
-                        timeout=5,  # 5 Sekunden Timeout
-                        cwd=temp_dir
-                    )
-                    
-                    if result.returncode == 0:
-                        return json.loads(result.stdout)
-                    else:
-                        raise Exception(f"Node.js execution failed: {result.stderr}")
-                        
-                except FileNotFoundError:
-                    # Node.js nicht verfügbar, verwende vereinfachte JS Interpretation
-                    return self._simple_js_decode(decoder_content, payload_bytes, metadata)
+                response_line = proc.stdout.readline()
+                if not response_line:
+                    raise BrokenPipeError("Node.js Worker beendet")
+            except (OSError, subprocess.TimeoutExpired):
+                # Hängender oder abgestürzter Worker: beenden und beim nächsten Aufruf neu starten
+                self._kill_node_worker(proc)
+                self._node_procs[slot] = None
+                raise
+        
+        return json_compat.loads(response_line)
+    
+    @staticmethod
+    def _kill_node_worker(proc: subprocess.Popen):
+        """Beende einen Node.js Worker, warte kurz auf sein Ende und schließe seine Pipes."""
+        try:
+            proc.kill()
+            proc.wait(timeout=NODE_KILL_WAIT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            _logger.warning("Node.js Worker (PID %s) nicht sauber beendet: %s", proc.pid, e)
+        for pipe in (proc.stdin, proc.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                # Ungeschriebene Daten im stdin-Puffer, der Prozess liest nicht mehr
+                pass
+    
+    def _decode_with_node_subprocess(self, decoder_info: Dict[str, Any], 
+                                     payload_bytes: bytes, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Dekodiere mit eigenem Node.js Prozess (Fallback wenn der Worker ausfällt).
+        
+        Der Prozess führt das Worker-Skript per `node -e` aus und bekommt genau eine
+        Anfrage-Zeile auf stdin; der Decoder wird direkt über seinen Pfad geladen.
+        """
+        try:
+            request_line = json_compat.dumps_str({
+                'f': os.path.abspath(decoder_info['file_path']),
+                'p': base64.b64encode(payload_bytes).decode('ascii'),
+                'm': metadata or {}
+            }) + '\n'
+            
+            try:
+                result = subprocess.run(
+                    ['node', '-e', NODE_WORKER_JS],
+                    input=request_line,
+                    capture_output=True,
+                    text=True,
+                    encoding='utf-8',
+                    timeout=NODE_TIMEOUT
+                )
+            except FileNotFoundError:
+                # Node.js nicht verfügbar, verwende vereinfachte JS Interpretation
+                engine = decoder_info.get('engine')
+                if engine is None:
+                    # Nur alte Registry-Einträge ohne Engine aus dem Quelltext erkennen
+                    with open(decoder_info['file_path'], 'r') as f:
+                        engine = self._detect_js_engine(f.read())
+                return self._simple_js_decode(engine, payload_bytes, metadata)
+            
+            if result.returncode != 0 or not result.stdout:
+                raise Exception(f"Node.js execution failed: {result.stderr}")
+            return self._javascript_result(decoder_info, json_compat.loads(result.stdout), payload_bytes)
                 
         except Exception as e:
             raise Exception(f"JavaScript decoding error: {str(e)}")
     
-    def _simple_js_decode(self, js_content: str, payload_bytes: List[int], 
+    def _simple_js_decode(self, engine: str, payload_bytes: bytes, 
                          metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Verbesserte JavaScript Dekodierung mit Sentinum Engine Logik."""
-        logging.warning("Node.js nicht verfügbar, verwende verbesserte Sentinum Engine")
+        _logger.warning("Node.js nicht verfügbar, verwende verbesserte Sentinum Engine")
         
         # Verwende professionelle Sentinum-Engine Logik
-        return self._sentinum_engine_decode(js_content, payload_bytes, metadata)
+        return self._sentinum_engine_decode(engine, payload_bytes, metadata)
     
-    def _decode_febris_python(self, payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def _decode_febris_python(self, payload_bytes: bytes, metadata: Dict[str, Any],
+                              verbose: bool = True) -> Dict[str, Any]:
         """Python-Implementierung des Febris TH Decoders."""
         try:
             bytes_data = payload_bytes
             decoded = {}
             
-            # Decode header
-            decoded['base_id'] = bytes_data[0] >> 4
-            decoded['major_version'] = bytes_data[0] & 0x0F
-            decoded['minor_version'] = bytes_data[1] >> 4
-            decoded['product_version'] = bytes_data[1] & 0x0F
-            decoded['up_cnt'] = bytes_data[2]
-            decoded['battery_voltage'] = ((bytes_data[3] << 8) | bytes_data[4]) / 1000.0
-            decoded['internal_temperature'] = ((bytes_data[5] << 8) | bytes_data[6]) / 10.0 - 100.0
+            # Decode header (Kernel)
+            header = _unpack_sentinum_header(_febris_unpack, bytes_data, SENTINUM_HEADER_LENGTH)
+            decoded['base_id'] = int(header[0])
+            decoded['major_version'] = int(header[1])
+            decoded['minor_version'] = int(header[2])
+            decoded['product_version'] = int(header[3])
+            decoded['up_cnt'] = int(header[4])
+            decoded['battery_voltage'] = header[5]
+            decoded['internal_temperature'] = header[6]
             
             it = 7
             
             if decoded['minor_version'] >= 3:
                 # Luftfeuchte: 2 Bytes (7-8) - entspricht JavaScript Decoder  
-                humidity_raw = (bytes_data[it] << 8) | bytes_data[it + 1]  # 2 Bytes kombinieren
+                humidity_raw = _U16_BE.unpack_from(bytes_data, it)[0]  # 2 Bytes Big-Endian
                 decoded['humidity'] = round(humidity_raw / 100.0, 1)  # Durch 100 teilen für %RH
                 it += 2  # 2 Bytes verbraucht
-                logging.debug(f"🌡️ Humidity korrigiert: {humidity_raw} raw → {decoded['humidity']}% RH (2-Byte)")
+                _logger.debug("🌡️ Humidity korrigiert: %s raw → %s%% RH (2-Byte)", humidity_raw, decoded['humidity'])
                 
                 if decoded['product_version'] & 0x01:  # Co2 und Druck enthalten
-                    decoded['pressure'] = (bytes_data[it] << 8) | bytes_data[it + 1]
-                    it += 2
-                    decoded['co2_ppm'] = (bytes_data[it] << 8) | bytes_data[it + 1]
-                    it += 2
+                    decoded['pressure'], decoded['co2_ppm'] = _U16_PAIR_BE.unpack_from(bytes_data, it)
+                    it += 4
                 else:
                     it += 4  # Werte überspringen
                 
@@ -590,127 +1422,55 @@ try {{
                 
                 # Taupunkt
                 if it + 1 < len(bytes_data):
-                    decoded['dew_point'] = ((bytes_data[it] << 8) | bytes_data[it + 1]) / 10.0 - 100.0
+                    decoded['dew_point'] = _U16_BE.unpack_from(bytes_data, it)[0] / 10.0 - 100.0
                     it += 2
                 
                 # Wandtemperatur und Feuchte
                 if decoded['product_version'] & 0x04:
                     if it + 4 < len(bytes_data):
-                        decoded['wall_temperature'] = ((bytes_data[it] << 8) | bytes_data[it + 1]) / 10.0 - 100.0
-                        it += 2
-                        decoded['therm_temperature'] = ((bytes_data[it] << 8) | bytes_data[it + 1]) / 10.0 - 100.0
-                        it += 2
+                        wall_raw, therm_raw = _U16_PAIR_BE.unpack_from(bytes_data, it)
+                        decoded['wall_temperature'] = wall_raw / 10.0 - 100.0
+                        decoded['therm_temperature'] = therm_raw / 10.0 - 100.0
+                        it += 4
                         # Wall Humidity: Nur 1 Byte für Wandfeuchte
                         wall_humidity_raw = bytes_data[it]
                         decoded['wall_humidity'] = wall_humidity_raw  # Direkt verwenden (schon in %)
                         it += 1
-                        logging.debug(f"🌡️ Wall Humidity: {wall_humidity_raw}% RH (1-Byte direkt)")
+                        _logger.debug("🌡️ Wall Humidity: %s%% RH (1-Byte direkt)", wall_humidity_raw)
                         
             # Konvertiere zu erwartetes Format
-            formatted_data = {}
+            formatted_data = _format_schema_fields(decoded, FEBRIS_PYTHON_SCHEMA, verbose)
             
-            if 'battery_voltage' in decoded:
-                formatted_data['battery_voltage'] = {
-                    'value': round(decoded['battery_voltage'], 2),
-                    'unit': 'V',
-                    'description': 'Battery Voltage'
-                }
-                
-            if 'humidity' in decoded:
-                formatted_data['humidity'] = {
-                    'value': round(decoded['humidity'], 1),
-                    'unit': '%RH',
-                    'description': 'Relative Humidity'
-                }
-                
-            if 'base_id' in decoded:
-                formatted_data['base_id'] = {
-                    'value': decoded['base_id'],
-                    'unit': '',
-                    'description': 'Base ID'
-                }
-                
-            if 'major_version' in decoded:
-                formatted_data['major_version'] = {
-                    'value': decoded['major_version'],
-                    'unit': '',
-                    'description': 'Major Version'
-                }
-                
-            if 'minor_version' in decoded:
-                formatted_data['minor_version'] = {
-                    'value': decoded['minor_version'],
-                    'unit': '',
-                    'description': 'Minor Version'
-                }
-                
-            if 'product_version' in decoded:
-                formatted_data['product_version'] = {
-                    'value': decoded['product_version'],
-                    'unit': '',
-                    'description': 'Product Version'
-                }
-                
-            if 'up_cnt' in decoded:
-                formatted_data['up_cnt'] = {
-                    'value': decoded['up_cnt'],
-                    'unit': '',
-                    'description': 'Up Count'
-                }
-                
-            if 'internal_temperature' in decoded:
-                formatted_data['internal_temperature'] = {
-                    'value': round(decoded['internal_temperature'], 1),
-                    'unit': '°C',
-                    'description': 'Internal Temperature'
-                }
-                
-            if 'alarm' in decoded:
-                formatted_data['alarm'] = {
-                    'value': decoded['alarm'],
-                    'unit': '',
-                    'description': 'Alarm'
-                }
-                
-            if 'dew_point' in decoded:
-                formatted_data['dew_point'] = {
-                    'value': round(decoded['dew_point'], 1),
-                    'unit': '°C',
-                    'description': 'Dew Point'
-                }
-            
-            return {
-                'decoded': True,
-                'decoder_type': 'febris_python',
-                'decoder_name': 'Febris TH (Python)',
-                'data': formatted_data,
-                'raw_data': payload_bytes
-            }
+            return {**_FEBRIS_PYTHON_RESULT, 'data': formatted_data, 'raw_data': payload_bytes}
             
         except Exception as e:
-            logging.error(f"Fehler beim Febris Python Decoding: {e}")
+            _logger.error("Fehler beim Febris Python Decoding: %s", e)
             return {
                 'decoded': False,
                 'reason': f'Febris Python decoding error: {str(e)}',
                 'raw_data': payload_bytes
             }
     
-    def _decode_juno_python(self, payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Python-Implementierung des Juno TH Decoders."""
+    def _decode_juno_python(self, payload_bytes: bytes, metadata: Dict[str, Any],
+                            result_header: Dict[str, Any] = _JUNO_PYTHON_RESULT,
+                            verbose: bool = True) -> Dict[str, Any]:
+        """Python-Implementierung des Juno TH Decoders (result_header bestimmt decoder_type/-name)."""
         try:
             bytes_data = payload_bytes
             decoded = {}
             
+            header = _unpack_sentinum_header(_juno_unpack, bytes_data, SENTINUM_HEADER_LENGTH - 1)
+            
             # Attributes (Juno Format)
-            decoded['base_id'] = bytes_data[0] >> 4
-            decoded['major_version'] = bytes_data[0] & 0x0F
-            decoded['minor_version'] = bytes_data[1] >> 4
-            decoded['product_version'] = bytes_data[1] & 0x0F
+            decoded['base_id'] = int(header[0])
+            decoded['major_version'] = int(header[1])
+            decoded['minor_version'] = int(header[2])
+            decoded['product_version'] = int(header[3])
             
             # Telemetry
-            decoded['up_cnt'] = bytes_data[2]
-            decoded['battery_voltage'] = ((bytes_data[3] << 8) | bytes_data[4]) / 1000.0
-            decoded['internal_temperature'] = bytes_data[5] - 128
+            decoded['up_cnt'] = int(header[4])
+            decoded['battery_voltage'] = header[5]
+            decoded['internal_temperature'] = int(header[6])
             
             # Version-dependent payload (minor_version > 1)
             if decoded['minor_version'] > 1:
@@ -734,7 +1494,7 @@ try {{
                         
                         # Temperature and Humidity
                         if idx + 2 < len(bytes_data):
-                            decoded['temperature'] = ((bytes_data[idx] << 8) | bytes_data[idx + 1]) / 10.0 - 100.0
+                            decoded['temperature'] = _U16_BE.unpack_from(bytes_data, idx)[0] / 10.0 - 100.0
                             idx += 2
                         if idx < len(bytes_data):
                             decoded['humidity'] = bytes_data[idx]
@@ -752,150 +1512,85 @@ try {{
                         decoded['opened_since_sent'] = bytes_data[idx]
                         idx += 1
                     if idx + 1 < len(bytes_data):
-                        decoded['opened_since_boot'] = (bytes_data[idx] << 8) | bytes_data[idx + 1]
+                        decoded['opened_since_boot'] = _U16_BE.unpack_from(bytes_data, idx)[0]
                         idx += 2
             
             # Konvertiere zu erwartetes Format
-            formatted_data = {}
+            formatted_data = _format_schema_fields(decoded, JUNO_PYTHON_SCHEMA, verbose)
             
-            if 'battery_voltage' in decoded:
-                formatted_data['battery_voltage'] = {
-                    'value': round(decoded['battery_voltage'], 2),
-                    'unit': 'V',
-                    'description': 'Battery Voltage'
-                }
-                
-            if 'temperature' in decoded:
-                formatted_data['temperature'] = {
-                    'value': round(decoded['temperature'], 1),
-                    'unit': '°C',
-                    'description': 'Temperature'
-                }
-                
-            if 'humidity' in decoded:
-                formatted_data['humidity'] = {
-                    'value': round(decoded['humidity'], 1),
-                    'unit': '%RH',
-                    'description': 'Relative Humidity'
-                }
-                
-            if 'base_id' in decoded:
-                formatted_data['base_id'] = {
-                    'value': decoded['base_id'],
-                    'unit': '',
-                    'description': 'Base ID'
-                }
-                
-            if 'major_version' in decoded:
-                formatted_data['major_version'] = {
-                    'value': decoded['major_version'],
-                    'unit': '',
-                    'description': 'Major Version'
-                }
-                
-            if 'minor_version' in decoded:
-                formatted_data['minor_version'] = {
-                    'value': decoded['minor_version'],
-                    'unit': '',
-                    'description': 'Minor Version'
-                }
-                
-            if 'product_version' in decoded:
-                formatted_data['product_version'] = {
-                    'value': decoded['product_version'],
-                    'unit': '',
-                    'description': 'Product Version'
-                }
-                
-            if 'up_cnt' in decoded:
-                formatted_data['up_cnt'] = {
-                    'value': decoded['up_cnt'],
-                    'unit': '',
-                    'description': 'Up Count'
-                }
-                
-            if 'internal_temperature' in decoded:
-                formatted_data['internal_temperature'] = {
-                    'value': round(decoded['internal_temperature'], 1),
-                    'unit': '°C',
-                    'description': 'Internal Temperature'
-                }
-            
-            return {
-                'decoded': True,
-                'decoder_type': 'juno_python',
-                'decoder_name': 'Juno TH (Python)',
-                'data': formatted_data,
-                'raw_data': payload_bytes
-            }
+            return {**result_header, 'data': formatted_data, 'raw_data': payload_bytes}
             
         except Exception as e:
-            logging.error(f"Fehler beim Juno Python Decoding: {e}")
+            _logger.error("Fehler beim Juno Python Decoding: %s", e)
             return {
                 'decoded': False,
                 'reason': f'Juno Python decoding error: {str(e)}',
                 'raw_data': payload_bytes
             }
     
-    def _sentinum_engine_decode(self, js_content: str, payload_bytes: List[int], 
+    def _sentinum_engine_decode(self, engine: str, payload_bytes: bytes, 
                                metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Professionelle Sentinum Engine Dekodierung in Python."""
         try:
-            # 1. ERSTE PRIORITÄT: Zugewiesene JS Decoder respektieren
-            if 'juno' in js_content.lower():
-                logging.info("🎯 Verwende zugewiesenen Juno JS Decoder")
-                return self._decode_juno_sentinum(payload_bytes, metadata)
-            elif 'febris' in js_content.lower():
-                logging.info("🎯 Verwende zugewiesenen Febris JS Decoder")
-                return self._decode_febris_sentinum(payload_bytes, metadata)
+            # 1. ERSTE PRIORITÄT: Zugewiesene JS Decoder respektieren (Engine aus der Analyse)
+            engine_method = self._engine_dispatch.get(engine)
+            if engine_method is not None:
+                _logger.info("🎯 Verwende zugewiesenen %s JS Decoder", _ENGINE_TITLES[engine])
+                return engine_method(payload_bytes, metadata)
             
             # 2. ZWEITE PRIORITÄT: Automatische Sensor-Typ-Erkennung als Fallback
             sensor_type = self._detect_sensor_type(payload_bytes)
-            logging.info(f"🔍 Fallback Auto-Detection: {sensor_type}")
+            _logger.info("🔍 Fallback Auto-Detection: %s", sensor_type)
             
-            if sensor_type == 'IO-Link-Adapter':
-                return self._decode_iolink_adapter(payload_bytes, metadata)
-            elif sensor_type == 'FEBR-Environmental':
-                return self._decode_febris_sentinum(payload_bytes, metadata)
-            else:
-                # Fallback zu generischem Decoder
-                return self._decode_generic_sentinum(payload_bytes, metadata, sensor_type)
+            decode_method = self._sensor_type_dispatch.get(sensor_type)
+            if decode_method is not None:
+                return decode_method(payload_bytes, metadata)
+            
+            # Fallback zu generischem Decoder
+            return self._decode_generic_sentinum(payload_bytes, metadata, sensor_type)
                 
         except Exception as e:
-            logging.error(f"Sentinum Engine Fehler: {e}")
+            _logger.error("Sentinum Engine Fehler: %s", e)
             return {
                 'decoded': False,
                 'reason': f'Sentinum Engine error: {str(e)}',
                 'raw_data': payload_bytes
             }
     
-    def _detect_sensor_type(self, payload_bytes: List[int]) -> str:
+    def _detect_sensor_type(self, payload_bytes: bytes) -> str:
         """Sensor-Typ basierend auf Payload erkennen."""
-        if len(payload_bytes) < 2:
+        length = len(payload_bytes)
+        if length < 2:
             return 'Unknown'
         
-        # Febris Environmental (17 bytes, startet mit 0x11)
-        if len(payload_bytes) == 17 and payload_bytes[0] == 0x11:
-            return 'FEBR-Environmental'
+        # Febris Environmental (17 bytes, startet mit 0x11) per Tabellen-Lookup
+        sensor_type = self._SENSOR_TYPE_TABLE.get((length, payload_bytes[0]))
+        if sensor_type:
+            return sensor_type
+        
+        return self._detect_sensor_type_by_rules(payload_bytes, length)
+    
+    def _detect_sensor_type_by_rules(self, payload_bytes: bytes, length: int) -> str:
+        """Regelbasierte Sensor-Erkennung für Payloads ohne exakte Signatur."""
+        first_byte = payload_bytes[0]
         
         # Febris Utility (12+ bytes)
-        if len(payload_bytes) >= 12 and 0x10 <= payload_bytes[0] <= 0x1F:
+        if length >= 12 and 0x10 <= first_byte <= 0x1F:
             return 'FEBR-Utility'
             
         # IO-Link Adapter Erkennung (mindestens 9 Bytes für Header)
-        if len(payload_bytes) >= 9:
-            control_byte = payload_bytes[0]
-            # IO-Link Format erkennen: Control Bits pattern prüfen
-            if (control_byte & 0x01) != 0:  # Control Bit 0 = 1
-                return 'IO-Link-Adapter'
+        # IO-Link Format erkennen: Control Bit 0 = 1
+        if length >= 9 and (first_byte & 0x01) != 0:
+            return 'IO-Link-Adapter'
         
         # Juno-ähnliche Sensoren
-        if len(payload_bytes) >= 6 and payload_bytes[0] <= 0x0F:
+        if length >= 6 and first_byte <= 0x0F:
             return 'Juno-TH'
         
         return 'Generic-mioty'
     
-    def _decode_febris_sentinum(self, payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def _decode_febris_sentinum(self, payload_bytes: bytes, metadata: Dict[str, Any],
+                                verbose: bool = True) -> Dict[str, Any]:
         """Professionelle Febris TH Dekodierung basierend auf Sentinum Engine."""
         try:
             if len(payload_bytes) < 17:
@@ -907,107 +1602,53 @@ try {{
             
             bytes_data = payload_bytes
             data = {}
+            header = _unpack_sentinum_header(_febris_unpack, bytes_data, SENTINUM_HEADER_LENGTH)
             
             # Byte 0: Base ID (obere 4 Bits) und Major Version (untere 4 Bits)
-            data['base_id'] = (bytes_data[0] >> 4) & 0x0F
-            data['major_version'] = bytes_data[0] & 0x0F
+            data['base_id'] = int(header[0])
+            data['major_version'] = int(header[1])
             
             # Byte 1: Minor Version (obere 4 Bits) und Product Version (untere 4 Bits)
-            data['minor_version'] = (bytes_data[1] >> 4) & 0x0F
-            data['product_version'] = bytes_data[1] & 0x0F
+            data['minor_version'] = int(header[2])
+            data['product_version'] = int(header[3])
             
             # Byte 2: Upload Counter
-            data['up_cnt'] = bytes_data[2]
-            
-            # Bytes 3-4: Battery Voltage (mV)
-            data['battery_voltage'] = ((bytes_data[3] << 8) | bytes_data[4]) / 1000.0
+            data['up_cnt'] = int(header[4])
             
-            # Bytes 5-6: Internal Temperature (0.1°C - 100°C offset)
-            temp_raw = (bytes_data[5] << 8) | bytes_data[6]
-            data['internal_temperature'] = (temp_raw / 10.0) - 100.0
-            
-            # Bytes 7-8: Relative Humidity (0.01% RH)
-            humidity_raw = (bytes_data[7] << 8) | bytes_data[8]
-            data['humidity'] = humidity_raw / 100.0
+            # Bytes 3-4: Battery Voltage (mV), Bytes 5-6: Internal Temperature (0.1°C - 100°C offset),
+            # Bytes 7-8: Relative Humidity (0.01% RH) - gemeinsam als 16-Bit Wörter
+            battery_voltage, internal_temperature, humidity = _unpack_febris_words(bytes_data)
+            data['battery_voltage'] = battery_voltage
+            data['internal_temperature'] = internal_temperature
+            data['humidity'] = humidity
             
             # Alarm Status (falls verfügbar)
             if len(bytes_data) > 14:
                 data['alarm'] = bytes_data[14]
             
-            # Taupunkt berechnen (Magnus-Formel)
-            if 'internal_temperature' in data and 'humidity' in data:
-                temp = data['internal_temperature']
-                rh = data['humidity']
-                
-                # Magnus-Formel für Taupunkt
-                a = 17.27
-                b = 237.7
-                import math
-                alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
-                data['dew_point'] = (b * alpha) / (a - alpha)
+            # Taupunkt berechnen (Magnus-Formel) - bei 0 %RH nicht definiert, dann weglassen
+            if humidity > 0:
+                alpha = ((MAGNUS_A * internal_temperature) / (MAGNUS_B + internal_temperature)) + _log(humidity / 100.0)
+                data['dew_point'] = (MAGNUS_B * alpha) / (MAGNUS_A - alpha)
             
             # Konvertiere zu erwartetes Format
-            formatted_data = {}
+            formatted_data = _format_schema_fields(data, FEBRIS_SENTINUM_SCHEMA, verbose)
             
-            for key, value in data.items():
-                if key in ['networkBaseType', 'networkSubType']:
-                    continue
-                
-                # Bestimme Einheit und Beschreibung
-                unit = ''
-                description = key.replace('_', ' ').title()
-                
-                if 'temperature' in key.lower():
-                    unit = '°C'
-                elif key == 'humidity':
-                    unit = '%RH'
-                    description = 'Relative Humidity'
-                elif 'battery' in key.lower() and 'voltage' in key.lower():
-                    unit = 'V'
-                    description = 'Battery Voltage'
-                elif 'dew_point' in key:
-                    unit = '°C'
-                    description = 'Dew Point'
-                
-                if isinstance(value, (int, float)):
-                    formatted_data[key] = {
-                        'value': round(value, 2),
-                        'unit': unit,
-                        'description': description
-                    }
-                else:
-                    formatted_data[key] = {
-                        'value': value,
-                        'unit': unit,
-                        'description': description
-                    }
+            return {**_FEBRIS_SENTINUM_RESULT, 'data': formatted_data, 'raw_data': payload_bytes}
             
-            return {
-                'decoded': True,
-                'decoder_type': 'sentinum_febris',
-                'decoder_name': 'Febris TH (Sentinum Engine)',
-                'data': formatted_data,
-                'raw_data': payload_bytes
-            }
-            
-        except Exception as e:
-            logging.error(f"Febris Sentinum Decoder Fehler: {e}")
+        except _PAYLOAD_ERRORS as e:
+            _logger.error("Febris Sentinum Decoder Fehler: %s", e)
             return {
                 'decoded': False,
                 'reason': f'Febris Sentinum decoding error: {str(e)}',
                 'raw_data': payload_bytes
             }
     
-    def _decode_juno_sentinum(self, payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Verbesserte Juno TH Dekodierung basierend auf Sentinum Engine."""
-        # Verwende die bereits implementierte Juno-Logik, aber mit Sentinum-Format
-        result = self._decode_juno_python(payload_bytes, metadata)
-        if result.get('decoded'):
-            result['decoder_type'] = 'sentinum_juno'
-            result['decoder_name'] = 'Juno TH (Sentinum Engine)'
-        return result
+    # Juno TH über die Sentinum Engine: gleiche Juno-Logik, nur mit Sentinum-Kopfteil im Ergebnis
+    _decode_juno_sentinum = functools.partialmethod(_decode_juno_python, result_header=_JUNO_SENTINUM_RESULT)
     
-    def _decode_iolink_adapter(self, payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def _decode_iolink_adapter(self, payload_bytes: bytes, metadata: Dict[str, Any],
+                               verbose: bool = True) -> Dict[str, Any]:
         """Professionelle IO-Link Adapter Dekodierung mit Vendor/Device-ID Extraktion."""
         try:
             if len(payload_bytes) < 9:
@@ -1020,93 +1661,61 @@ try {{
             bytes_data = payload_bytes
             data = {}
             
+            # Header in einem Aufruf: Bytes 0, 1, 2-3 und 5-6 (alle Big-Endian, Byte 4 = 0x00 übersprungen)
+            control_byte, pd_in_length, vendor_id, device_id = _IOLINK_HEADER.unpack_from(bytes_data)
+            
             # Byte 0: Control Byte (verschiedene Control Bits)
-            control_byte = bytes_data[0]
             data['control_byte'] = control_byte
-            data['control_bit_0'] = (control_byte & 0x01) != 0
-            data['control_bit_1'] = (control_byte & 0x02) != 0
-            data['control_bit_2'] = (control_byte & 0x04) != 0
-            data['control_bit_3'] = (control_byte & 0x08) != 0
+            (data['control_bit_0'], data['control_bit_1'],
+             data['control_bit_2'], data['control_bit_3']) = _IOLINK_CONTROL_BITS[control_byte & 0x0F]
             
             # Byte 1: PD-in length
-            pd_in_length = bytes_data[1]
             data['pd_in_length'] = pd_in_length
             
+            vendor_id_hex, device_id_hex, ioddfinder_url = _iolink_id_strings(vendor_id, device_id)
+            
             # Bytes 2-3: Vendor ID (2 Bytes, Big Endian)
-            vendor_id = (bytes_data[2] << 8) | bytes_data[3]
             data['vendor_id'] = vendor_id
-            data['vendor_id_hex'] = f"0x{vendor_id:04X}"
+            data['vendor_id_hex'] = vendor_id_hex
             
-            # Bytes 4-6: Device ID (3 Bytes, Big-Endian, letztes Byte ignorieren!)
-            # Korrektur: Device ID ist ebenfalls Big-Endian wie Vendor ID
-            device_id_bytes = bytes_data[5:7]  # Bytes 5-6 (Skip Byte 4 = 0x00)
-            device_id = (device_id_bytes[0] << 8) | device_id_bytes[1]  # Big-Endian
+            # Bytes 4-6: Device ID (Bytes 5-6, Big-Endian wie Vendor ID)
             data['device_id'] = device_id
-            data['device_id_hex'] = f"0x{device_id:04X}"
+            data['device_id_hex'] = device_id_hex
             
-            logging.info(f"🔗 IO-LINK ADAPTER ERKANNT!")
-            logging.info(f"🏭 Vendor ID: {vendor_id} (0x{vendor_id:04X})")
-            logging.info(f"📱 Device ID: {device_id} (0x{device_id:04X})")
-            logging.info(f"📊 PD-in: {pd_in_length} bytes")
-            logging.info(f"🔧 Bytes 2-3 (Vendor): {bytes_data[2]:02X} {bytes_data[3]:02X}")
-            logging.info(f"🔧 Bytes 5-6 (Device): {bytes_data[5]:02X} {bytes_data[6]:02X} (Big-Endian)")
+            # Diagnose-Ausgaben nur formatieren, wenn INFO tatsächlich geloggt wird
+            if _logger.isEnabledFor(logging.INFO):
+                _logger.info("🔗 IO-LINK ADAPTER ERKANNT!")
+                _logger.info("🏭 Vendor ID: %d (%s)", vendor_id, vendor_id_hex)
+                _logger.info("📱 Device ID: %d (%s)", device_id, device_id_hex)
+                _logger.info("📊 PD-in: %d bytes", pd_in_length)
+                _logger.info("🔧 Bytes 2-3 (Vendor): %02X %02X", bytes_data[2], bytes_data[3])
+                _logger.info("🔧 Bytes 5-6 (Device): %02X %02X (Big-Endian)", bytes_data[5], bytes_data[6])
             
             # Prozessdaten extrahieren (falls vorhanden)
             pd_start_index = 7  # Nach dem korrigierten Header (nicht mehr 9!)
             if len(bytes_data) > pd_start_index:
                 if len(bytes_data) >= pd_start_index + pd_in_length:
                     process_data = bytes_data[pd_start_index:pd_start_index + pd_in_length]
-                    data['process_data'] = process_data
-                    data['process_data_hex'] = ' '.join([f"{b:02X}" for b in process_data])
+                    data['process_data'] = list(process_data)
+                    data['process_data_hex'] = process_data.hex(' ').upper()
             
-            # Event Daten (falls vorhanden - letzte 4 Bytes)
-            if len(bytes_data) >= 4:
-                event_data = bytes_data[-4:-1]  # Letzte 3 Bytes für Event
-                adapter_event = bytes_data[-1]   # Letztes Byte für Adapter Event
-                data['event_data'] = event_data
-                data['adapter_event'] = adapter_event
+            # Event Daten (letzte 4 Bytes, Payload hat mindestens 9): 3 Bytes Event + 1 Byte Adapter Event
+            *data['event_data'], data['adapter_event'] = bytes_data[-4:]
             
             # Konvertiere zu erwartetes Format
-            formatted_data = {}
-            
-            for key, value in data.items():
-                # Bestimme Einheit und Beschreibung
-                unit = ''
-                description = key.replace('_', ' ').title()
-                
-                if key == 'vendor_id':
-                    description = 'Vendor ID'
-                elif key == 'device_id':
-                    description = 'Device ID'
-                elif key == 'vendor_id_hex':
-                    description = 'Vendor ID (Hex)'
-                elif key == 'device_id_hex':
-                    description = 'Device ID (Hex)'
-                elif 'length' in key:
-                    unit = 'bytes'
-                elif 'process_data' in key:
-                    description = 'Process Data'
-                    unit = 'hex'
-                
-                formatted_data[key] = {
-                    'value': value,
-                    'unit': unit,
-                    'description': description
-                }
+            formatted_data = _format_schema_fields(data, IOLINK_ADAPTER_SCHEMA, verbose)
             
             return {
-                'decoded': True,
-                'decoder_type': 'iolink_adapter',
-                'decoder_name': 'IO-Link Adapter (mioty)',
+                **_IOLINK_ADAPTER_RESULT,
                 'data': formatted_data,
                 'raw_data': payload_bytes,
                 'vendor_id': vendor_id,
                 'device_id': device_id,
-                'ioddfinder_url': f"https://ioddfinder.com/devices?vendor={vendor_id}&device={device_id}"
+                'ioddfinder_url': ioddfinder_url
             }
             
-        except Exception as e:
-            logging.error(f"IO-Link Adapter Dekodierung fehlgeschlagen: {e}")
+        except _PAYLOAD_ERRORS as e:
+            _logger.error("IO-Link Adapter Dekodierung fehlgeschlagen: %s", e)
             return {
                 'decoded': False,
                 'reason': f'IO-Link decode error: {str(e)}',
@@ -1114,7 +1723,7 @@ try {{
             }
     
     def _decode_with_iodd(self, decoder_info: Dict[str, Any], 
-                         payload_bytes: List[int], metadata: Dict[str, Any]) -> Dict[str, Any]:
+                         payload_bytes: bytes, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Dekodiere mit IODD (IO Device Description) für IO-Link Sensoren."""
         try:
             # Zuerst IO-Link Adapter Informationen extrahieren
@@ -1126,11 +1735,9 @@ try {{
                 }
             
             # Extrahiere Vendor/Device ID aus Payload (beide Big-Endian)
-            vendor_id = (payload_bytes[2] << 8) | payload_bytes[3]
-            device_id_bytes = payload_bytes[5:7]
-            device_id = (device_id_bytes[0] << 8) | device_id_bytes[1]
+            _, _, vendor_id, device_id = _IOLINK_HEADER.unpack_from(payload_bytes)
             
-            logging.info(f"🔗 IODD-Dekodierung für Vendor {vendor_id} (0x{vendor_id:04X}), Device {device_id} (0x{device_id:04X})")
+            _logger.info("🔗 IODD-Dekodierung für Vendor %s (0x%04X), Device %s (0x%04X)", vendor_id, vendor_id, device_id, device_id)
             
             # Zuerst die IO-Link Adapter-Basisdaten dekodieren
             base_result = self._decode_iolink_adapter(payload_bytes, metadata)
@@ -1159,7 +1766,7 @@ try {{
             }
             
         except Exception as e:
-            logging.error(f"IODD Dekodierung fehlgeschlagen: {e}")
+            _logger.error("IODD Dekodierung fehlgeschlagen: %s", e)
             return {
                 'decoded': False,
                 'reason': f'IODD decode error: {str(e)}',
@@ -1167,16 +1774,14 @@ try {{
             }
     
     def _parse_iodd_process_data(self, decoder_info: Dict[str, Any], 
-                                payload_bytes: List[int], vendor_id: int, device_id: int) -> Dict[str, Any]:
+                                payload_bytes: bytes, vendor_id: int, device_id: int) -> Dict[str, Any]:
         """Parse IODD XML-Datei und dekodiere Prozessdaten entsprechend der Definition."""
         try:
-            import xml.etree.ElementTree as ET
-            
             # IODD-Datei laden
             filename = decoder_info.get('filename') or decoder_info.get('file_path', '').split('/')[-1]
             iodd_file_path = self.decoder_dir / filename
             if not iodd_file_path.exists():
-                logging.warning(f"IODD-Datei nicht gefunden: {iodd_file_path}")
+                _logger.warning("IODD-Datei nicht gefunden: %s", iodd_file_path)
                 return {}
             
             # XML parsen
@@ -1193,7 +1798,7 @@ try {{
             pd_length = payload_bytes[1] if len(payload_bytes) > 1 else 0
             
             if len(payload_bytes) < pd_start_index + pd_length:
-                logging.warning(f"Nicht genügend Prozessdaten: erwartet {pd_length}, verfügbar {len(payload_bytes) - pd_start_index}")
+                _logger.warning("Nicht genügend Prozessdaten: erwartet %s, verfügbar %s", pd_length, len(payload_bytes) - pd_start_index)
                 return {}
             
             process_data = payload_bytes[pd_start_index:pd_start_index + pd_length]
@@ -1212,16 +1817,16 @@ try {{
                     total_bits = int(bit_length)
                     expected_bytes = (total_bits + 7) // 8  # Aufrunden auf Bytes
                     
-                    logging.info(f"📋 IODD ProcessDataIn: {total_bits} Bits ({expected_bytes} Bytes), verfügbar: {len(process_data)} Bytes")
+                    _logger.info("📋 IODD ProcessDataIn: %s Bits (%s Bytes), verfügbar: %s Bytes", total_bits, expected_bytes, len(process_data))
                     
                     # Prozessdaten mit IODD-Definition dekodieren
                     if len(process_data) >= expected_bytes:
                         parsed_data.update(self._decode_iodd_structured_data(process_data_in, process_data, namespaces))
                     else:
-                        logging.warning(f"Prozessdaten zu kurz: {len(process_data)} < {expected_bytes}")
+                        _logger.warning("Prozessdaten zu kurz: %s < %s", len(process_data), expected_bytes)
                         
                 except ValueError:
-                    logging.warning(f"Ungültige bitLength in IODD: {bit_length}")
+                    _logger.warning("Ungültige bitLength in IODD: %s", bit_length)
             
             # Falls keine strukturierte Daten gefunden, generische Dekodierung
             if not parsed_data:
@@ -1235,7 +1840,7 @@ try {{
             return parsed_data
             
         except Exception as e:
-            logging.error(f"IODD ProcessData Parsing fehlgeschlagen: {e}")
+            _logger.error("IODD ProcessData Parsing fehlgeschlagen: %s", e)
             return {}
     
     def _decode_iodd_structured_data(self, process_data_in, process_data: List[int], namespaces: Dict[str, str]) -> Dict[str, Any]:
@@ -1281,7 +1886,7 @@ try {{
                     }
             
         except Exception as e:
-            logging.warning(f"IODD Strukturdekodierung fehlgeschlagen: {e}")
+            _logger.warning("IODD Strukturdekodierung fehlgeschlagen: %s", e)
             # Fallback: einfache Byte-Auflistung
             for i, byte_val in enumerate(process_data):
                 parsed_data[f'iodd_fallback_{i}'] = {
@@ -1292,7 +1897,7 @@ try {{
         
         return parsed_data
     
-    def _extract_bits_from_bytes(self, data: List[int], bit_offset: int, bit_length: int) -> int:
+    def _extract_bits_from_bytes(self, data: bytes, bit_offset: int, bit_length: int) -> int:
         """Extrahiere spezifische Bits aus Byte-Array."""
         if bit_length <= 0:
             return 0
@@ -1319,38 +1924,23 @@ try {{
         
         return value
     
-    def _decode_generic_sentinum(self, payload_bytes: List[int], metadata: Dict[str, Any], 
-                                sensor_type: str) -> Dict[str, Any]:
+    def _decode_generic_sentinum(self, payload_bytes: bytes, metadata: Dict[str, Any], 
+                                sensor_type: str, verbose: bool = True) -> Dict[str, Any]:
         """Generischer Sentinum Decoder für unbekannte Sensoren."""
         try:
             data = {}
             
-            # Basis-Parsing für mioty-Sensoren
-            if len(payload_bytes) >= 6:
-                # Standard mioty Header
-                data['sensor_id'] = payload_bytes[0]
-                data['packet_type'] = payload_bytes[1] if len(payload_bytes) > 1 else 0
-                
-                # Einfache Werte extrahieren
-                if len(payload_bytes) >= 4:
-                    value1 = (payload_bytes[2] << 8) | payload_bytes[3]
-                    data['value1'] = value1
-                
-                if len(payload_bytes) >= 6:
-                    value2 = (payload_bytes[4] << 8) | payload_bytes[5]
-                    data['value2'] = value2
-            
-            formatted_data = {}
-            for key, value in data.items():
-                formatted_data[key] = {
-                    'value': value,
-                    'unit': '',
-                    'description': key.replace('_', ' ').title()
-                }
+            # Basis-Parsing für mioty-Sensoren: Standard mioty Header und zwei 16-Bit Werte
+            if len(payload_bytes) >= _GENERIC_HEADER.size:
+                (data['sensor_id'], data['packet_type'],
+                 data['value1'], data['value2']) = _GENERIC_HEADER.unpack_from(payload_bytes)
+            
+            formatted_data = _format_schema_fields(data, GENERIC_SENTINUM_SCHEMA, verbose)
             
             # Raw Data als Hex hinzufügen
-            formatted_data['raw_hex'] = {
-                'value': ' '.join(f'{b:02X}' for b in payload_bytes),
+            raw_hex = payload_bytes.hex(' ').upper()
+            formatted_data['raw_hex'] = raw_hex if not verbose else {
+                'value': raw_hex,
                 'unit': 'hex',
                 'description': 'Raw Hex Data'
             }
@@ -1363,7 +1953,7 @@ try {{
                 'raw_data': payload_bytes
             }
             
-        except Exception as e:
+        except _PAYLOAD_ERRORS as e:
             return {
                 'decoded': False,
                 'reason': f'Generic Sentinum decoding error: {str(e)}',
@@ -1371,8 +1961,13 @@ try {{
             }
     
     def get_available_decoders(self) -> Dict[str, Any]:
-        """Gib alle verfügbaren Decoder zurück."""
-        return self.decoder_files.copy()
+        """Gib alle verfügbaren Decoder zurück (Kopie, der Watchdog-Thread ändert die Registry)."""
+        with self._files_lock:
+            lazy_names = [name for name, info in self.decoder_files.items() if info.get('lazy')]
+        for decoder_name in lazy_names:
+            self._ensure_analyzed(decoder_name)
+        with self._files_lock:
+            return self.decoder_files.copy()
     
     def get_sensor_decoder_assignments(self) -> Dict[str, Any]:
         """Gib alle Sensor-Decoder Zuweisungen zurück."""
@@ -1380,30 +1975,30 @@ try {{
     
     def delete_decoder(self, decoder_name: str) -> bool:
         """Lösche Decoder-Datei und Zuweisungen."""
-        if decoder_name not in self.decoder_files:
+        decoder_info = self.decoder_files.get(decoder_name)
+        if decoder_info is None:
             return False
         
         try:
             # Lösche Datei
-            file_path = Path(self.decoder_files[decoder_name]['file_path'])
+            file_path = Path(decoder_info['file_path'])
             if file_path.exists():
                 file_path.unlink()
             
             # Entferne aus Registry
-            del self.decoder_files[decoder_name]
+            with self._files_lock:
+                self.decoder_files.pop(decoder_name, None)
+                self._resolved_decoders.clear()
             
-            # Entferne alle Sensor-Zuweisungen zu diesem Decoder
-            to_remove = [eui for eui, assignment in self.decoders.items() 
-                        if assignment['decoder_name'] == decoder_name]
-            for eui in to_remove:
-                del self.decoders[eui]
+            # Entferne alle Sensor-Zuweisungen zu diesem Decoder (über den invertierten Index)
+            for eui in self._by_decoder.pop(decoder_name, ()):
+                self.decoders.pop(eui, None)
             
-            return self.save_decoders()
+            # Sofort kompaktieren, damit das Journal keine Zuweisungen zum gelöschten Decoder enthält
+            self.save_decoders()
+            return self.flush_decoders()
             
         except Exception as e:
-            logging.error(f"Fehler beim Löschen des Decoders {decoder_name}: {e}")
+            _logger.error("Fehler beim Löschen des Decoders %s: %s", decoder_name, e)
             return False
 
-
-# Für Module Import
-import time
\ No newline at end of file
@@ -2,13 +2,42 @@
 Service Center API Client für BSSCI Service Center Integration
 Ermöglicht die Anmeldung und Verwaltung von Sensoren am Service Center
 """
-import requests
-import json
 import logging
-from typing import Dict, List, Optional, Any
+import re
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
+
+if TYPE_CHECKING:
+    import urllib3
+
+import json_compat
 
 logger = logging.getLogger(__name__)
 
+# Validierung der Sensor-Parameter (Länge und Hex-Zeichen in einem Schritt)
+_HEX16 = re.compile(r'[0-9A-Fa-f]{16}').fullmatch
+_HEX32 = re.compile(r'[0-9A-Fa-f]{32}').fullmatch
+_HEX4 = re.compile(r'[0-9A-Fa-f]{4}').fullmatch
+
+# Wie lange get_sensors() die letzte Sensorliste ohne Rückfrage wiederverwendet
+SENSORS_CACHE_TTL = 2.0
+
+# Wie lange nach einem Verbindungsfehler/Timeout Anfragen ohne Netzwerkzugriff abgewiesen werden
+UNREACHABLE_RETRY_AFTER = 5.0
+
+class ServiceCenterHTTPError(Exception):
+    """HTTP-Fehlerstatus einer Service Center Antwort"""
+    
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} für {url}")
+        self.status = status
+
+class ServiceCenterUnavailable(Exception):
+    """Service Center war kürzlich nicht erreichbar, Anfrage wurde nicht gesendet"""
+    
+    def __init__(self, url: str):
+        super().__init__(f"Service Center vorübergehend nicht erreichbar: {url}")
+
 class ServiceCenterClient:
     """Client für die Kommunikation mit dem BSSCI Service Center"""
     
@@ -22,57 +51,201 @@ class ServiceCenterClient:
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
+        self._headers = {
             'Content-Type': 'application/json',
             'User-Agent': 'mioty-application-center/1.0'
-        })
+        }
+        # Verbindungspool entsteht erst bei der ersten Anfrage (siehe _http)
+        self._http_pool: Optional['urllib3.PoolManager'] = None
+        
+        # Letzter Verbindungsfehler; bis _unreachable_until schlagen Anfragen sofort fehl
+        self._unreachable_error: Optional[Exception] = None
+        self._unreachable_until = 0.0
+        
+        # Sensorliste mit ETag für bedingte Abfragen; Schreibzugriffe setzen den Zeitstempel zurück
+        self._sensors_cache: Optional[List[Dict[str, Any]]] = None
+        self._sensors_cache_ts = 0.0
+        self._sensors_etag: Optional[str] = None
     
-    def test_connection(self) -> Dict[str, Any]:
+    @property
+    def _http(self) -> 'urllib3.PoolManager':
         """
-        Testet die Verbindung zum Service Center
+        Verbindungspool direkt über urllib3 (ohne PreparedRequest/Hooks von requests)
+        
+        urllib3 wird erst hier importiert, damit der Add-on-Start ohne konfiguriertes
+        Service Center den Import nicht bezahlt.
+        """
+        if self._http_pool is None:
+            import urllib3
+            from urllib3.util.retry import Retry
+            
+            # Wiederholung bei kurzen Störungen (502/503/504) nur für idempotente Methoden -
+            # ein POST (Anmeldung, Attach/Detach) kann trotz 5xx schon ausgeführt worden sein.
+            # read=0: eine bereits gesendete Anfrage ohne Antwort wird nicht erneut geschickt.
+            self._http_pool = urllib3.PoolManager(
+                num_pools=4,
+                maxsize=32,
+                headers=self._headers,
+                retries=Retry(
+                    total=2,
+                    read=0,
+                    backoff_factor=0.1,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'DELETE']),
+                    raise_on_status=False
+                )
+            )
+        return self._http_pool
+    
+    def close(self):
+        """Gibt die Verbindungen des Clients frei"""
+        if self._http_pool is not None:
+            self._http_pool.clear()
+    
+    def _request(self, method: str, path: str, body: Any = None) -> Tuple[bool, Any]:
+        """
+        Führt eine Anfrage an das Service Center aus
+        
+        Args:
+            method: HTTP-Methode
+            path: Pfad relativ zur Basis-URL
+            body: Optionaler JSON-Body
         
         Returns:
-            Dict mit Connection-Status und Informationen
+            (True, dekodierte Antwort) oder (False, aufgetretene Exception)
+        """
+        try:
+            response = self._send(method, path, body)
+            return True, json_compat.loads(response.data)
+        except Exception as e:
+            return False, e
+    
+    def _send(self, method: str, path: str, body: Any = None,
+              headers: Optional[Dict[str, str]] = None) -> 'urllib3.HTTPResponse':
         """
+        Sendet eine Anfrage über den Verbindungspool
+        
+        Raises:
+            ServiceCenterHTTPError: bei HTTP-Status ab 400
+            ServiceCenterUnavailable: innerhalb von UNREACHABLE_RETRY_AFTER nach einem Verbindungsfehler
+            urllib3.exceptions.HTTPError: bei Verbindungsfehlern und Timeouts
+        """
+        url = f"{self.base_url}{path}"
+        if time.monotonic() < self._unreachable_until:
+            raise ServiceCenterUnavailable(url) from self._unreachable_error
+        
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/bssci/status",
+            response = self._http.request(
+                method,
+                url,
+                body=None if body is None else json_compat.dumps_bytes(body),
+                headers=headers,
                 timeout=self.timeout
             )
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"Service Center verbunden: {self.base_url}")
+        except Exception as e:
+            from urllib3 import exceptions as urllib3_errors
+            # Eigentliche Ursache (Verbindungsfehler, Timeout) weitergeben
+            cause = e.reason if isinstance(e, urllib3_errors.MaxRetryError) and e.reason else e
+            if isinstance(cause, (urllib3_errors.TimeoutError, urllib3_errors.ProtocolError)):
+                self._unreachable_error = cause
+                self._unreachable_until = time.monotonic() + UNREACHABLE_RETRY_AFTER
+            if cause is e:
+                raise
+            raise cause
+        
+        # Service Center hat geantwortet
+        self._unreachable_until = 0.0
+        if method != 'GET':
+            # Schreibzugriff: nächste Sensorabfrage muss neu validieren
+            self._sensors_cache_ts = 0.0
+        if response.status >= 400:
+            raise ServiceCenterHTTPError(response.status, url)
+        return response
+    
+    def _command(self, method: str, path: str, action: str, success_message: str,
+                 eui: Optional[str] = None, body: Any = None,
+                 server_message: bool = False) -> Dict[str, Any]:
+        """
+        Führt eine schreibende Operation aus und normalisiert das Ergebnis
+        
+        Args:
+            method: HTTP-Methode
+            path: Pfad relativ zur Basis-URL
+            action: Bezeichnung der Operation für Meldungen (z.B. 'Löschung')
+            success_message: Meldung bei Erfolg
+            eui: Betroffener Sensor (für Meldungen)
+            body: Optionaler JSON-Body
+            server_message: Erfolgsmeldung des Service Centers bevorzugen
+        
+        Returns:
+            Dict mit Ergebnis der Operation
+        """
+        target = f" für {eui}" if eui else ""
+        ok, result = self._request(method, path, body)
+        if not ok:
+            error_msg = f"Fehler bei Service Center {action}{target}: {str(result)}"
+            logger.error(error_msg)
+            return {
+                'success': False,
+                'message': error_msg
+            }
+        
+        if result.get('success'):
+            message = result.get('message', success_message) if server_message else success_message
+            logger.info("Service Center: %s", message)
+            return {
+                'success': True,
+                'message': message
+            }
+        
+        error_msg = result.get('message', 'Unbekannter Fehler')
+        logger.error("Service Center %s fehlgeschlagen%s: %s", action, target, error_msg)
+        return {
+            'success': False,
+            'message': f'Service Center {action} fehlgeschlagen: {error_msg}'
+        }
+    
+    def test_connection(self) -> Dict[str, Any]:
+        """
+        Testet die Verbindung zum Service Center
+        
+        Returns:
+            Dict mit Connection-Status und Informationen
+        """
+        ok, data = self._request('GET', '/api/bssci/status')
+        if ok:
+            logger.info("Service Center verbunden: %s", self.base_url)
             return {
                 'connected': True,
                 'status': data,
                 'message': 'Verbindung erfolgreich'
             }
-        except requests.exceptions.ConnectionError:
+        
+        from urllib3 import exceptions as urllib3_errors
+        
+        if isinstance(data, ServiceCenterUnavailable):
+            # Zwischengespeicherter Fehler: nach der ursprünglichen Ursache einordnen
+            data = data.__cause__
+        
+        # Verbindungsaufbau (ConnectTimeoutError ist Basis von NewConnectionError) vor
+        # allgemeinen Timeouts prüfen, da beide von TimeoutError erben
+        if isinstance(data, (urllib3_errors.ConnectTimeoutError, urllib3_errors.ProtocolError)):
             error_msg = f"Service Center nicht erreichbar: {self.base_url}"
             logger.warning(error_msg)
-            return {
-                'connected': False,
-                'error': 'Connection Error',
-                'message': error_msg
-            }
-        except requests.exceptions.Timeout:
+            error = 'Connection Error'
+        elif isinstance(data, urllib3_errors.TimeoutError):
             error_msg = f"Service Center Timeout: {self.base_url}"
             logger.warning(error_msg)
-            return {
-                'connected': False,
-                'error': 'Timeout',
-                'message': error_msg
-            }
-        except Exception as e:
-            error_msg = f"Service Center Fehler: {str(e)}"
+            error = 'Timeout'
+        else:
+            error_msg = f"Service Center Fehler: {str(data)}"
             logger.error(error_msg)
-            return {
-                'connected': False,
-                'error': str(e),
-                'message': error_msg
-            }
+            error = str(data)
+        return {
+            'connected': False,
+            'error': error,
+            'message': error_msg
+        }
     
     def get_sensors(self) -> List[Dict[str, Any]]:
         """
@@ -81,31 +254,38 @@ class ServiceCenterClient:
         Returns:
             Liste aller Sensoren mit Status-Informationen
         """
+        cached = self._sensors_cache
+        if cached is not None and time.monotonic() - self._sensors_cache_ts < SENSORS_CACHE_TTL:
+            return cached
+        
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/sensors",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            headers = None
+            if cached is not None and self._sensors_etag:
+                headers = {**self._headers, 'If-None-Match': self._sensors_etag}
+            response = self._send('GET', '/api/sensors', headers=headers)
+            if response.status == 304:
+                self._sensors_cache_ts = time.monotonic()
+                return cached
             
-            data = response.json()
-            # Konvertiere das Dictionary zu einer Liste
+            data = json_compat.loads(response.data)
+            # Konvertiere das Dictionary zu einer Liste - die frisch geparsten
+            # Sensor-Dicts werden direkt ergänzt statt kopiert
             sensors = []
             for eui, sensor_data in data.items():
-                sensor_info = {
-                    'eui': eui,
-                    'registered': sensor_data.get('registered', False),
-                    'base_stations': sensor_data.get('base_stations', []),
-                    'total_registrations': sensor_data.get('total_registrations', 0),
-                    **sensor_data
-                }
-                sensors.append(sensor_info)
+                sensor_data.setdefault('eui', eui)
+                sensor_data.setdefault('registered', False)
+                sensor_data.setdefault('base_stations', [])
+                sensor_data.setdefault('total_registrations', 0)
+                sensors.append(sensor_data)
             
-            logger.info(f"Service Center: {len(sensors)} Sensoren geladen")
+            logger.info("Service Center: %d Sensoren geladen", len(sensors))
+            self._sensors_etag = response.headers.get('ETag')
+            self._sensors_cache = sensors
+            self._sensors_cache_ts = time.monotonic()
             return sensors
             
         except Exception as e:
-            logger.error(f"Fehler beim Laden der Service Center Sensoren: {e}")
+            logger.error("Fehler beim Laden der Service Center Sensoren: %s", e)
             return []
     
     def add_sensor(self, eui: str, nw_key: str, short_addr: str = "0000", bidi: bool = False) -> Dict[str, Any]:
@@ -121,52 +301,40 @@ class ServiceCenterClient:
         Returns:
             Dict mit Ergebnis der Operation
         """
-        try:
-            # Validiere Input
-            if len(eui) != 16:
-                return {'success': False, 'message': 'EUI muss 16 Hex-Zeichen haben'}
-            if len(nw_key) != 32:
-                return {'success': False, 'message': 'Network Key muss 32 Hex-Zeichen haben'}
-            if len(short_addr) != 4:
-                return {'success': False, 'message': 'Short Address muss 4 Hex-Zeichen haben'}
-            
-            sensor_data = {
-                'eui': eui.upper(),
-                'nwKey': nw_key.upper(),
-                'shortAddr': short_addr.upper(),
-                'bidi': bidi
-            }
-            
-            response = self.session.post(
-                f"{self.base_url}/api/sensors",
-                json=sensor_data,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('success'):
-                logger.info(f"Sensor {eui} erfolgreich am Service Center angemeldet")
-                return {
-                    'success': True,
-                    'message': f'Sensor {eui} erfolgreich am Service Center angemeldet',
-                    'sensor': sensor_data
-                }
-            else:
-                error_msg = result.get('message', 'Unbekannter Fehler')
-                logger.error(f"Service Center Anmeldung fehlgeschlagen für {eui}: {error_msg}")
-                return {
-                    'success': False,
-                    'message': f'Service Center Anmeldung fehlgeschlagen: {error_msg}'
-                }
-                
-        except Exception as e:
-            error_msg = f"Fehler bei Service Center Anmeldung für {eui}: {str(e)}"
-            logger.error(error_msg)
-            return {
-                'success': False,
-                'message': error_msg
-            }
+        # Validiere Input
+        error_msg = self._validate_sensor(eui, nw_key, short_addr)
+        if error_msg:
+            return {'success': False, 'message': error_msg}
+        
+        sensor_data = self._sensor_payload(eui, nw_key, short_addr, bidi)
+        result = self._command('POST', '/api/sensors', 'Anmeldung',
+                               f'Sensor {eui} erfolgreich am Service Center angemeldet',
+                               eui=eui, body=sensor_data)
+        if result['success']:
+            result['sensor'] = sensor_data
+        return result
+    
+    @staticmethod
+    def _validate_sensor(eui: str, nw_key: str, short_addr: str) -> Optional[str]:
+        """Prüfe Sensor-Parameter, gibt Fehlermeldung oder None zurück"""
+        # JSON-Eingaben können null oder Zahlen enthalten - fullmatch braucht einen String
+        if not isinstance(eui, str) or not _HEX16(eui):
+            return 'EUI muss 16 Hex-Zeichen haben'
+        if not isinstance(nw_key, str) or not _HEX32(nw_key):
+            return 'Network Key muss 32 Hex-Zeichen haben'
+        if not isinstance(short_addr, str) or not _HEX4(short_addr):
+            return 'Short Address muss 4 Hex-Zeichen haben'
+        return None
+    
+    @staticmethod
+    def _sensor_payload(eui: str, nw_key: str, short_addr: str, bidi: bool) -> Dict[str, Any]:
+        """Baue den Request-Body für einen Sensor"""
+        return {
+            'eui': eui.upper(),
+            'nwKey': nw_key.upper(),
+            'shortAddr': short_addr.upper(),
+            'bidi': bidi
+        }
     
     def delete_sensor(self, eui: str) -> Dict[str, Any]:
         """
@@ -178,35 +346,8 @@ class ServiceCenterClient:
         Returns:
             Dict mit Ergebnis der Operation
         """
-        try:
-            response = self.session.delete(
-                f"{self.base_url}/api/sensors/{eui}",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('success'):
-                logger.info(f"Sensor {eui} vom Service Center gelöscht")
-                return {
-                    'success': True,
-                    'message': f'Sensor {eui} erfolgreich vom Service Center gelöscht'
-                }
-            else:
-                error_msg = result.get('message', 'Unbekannter Fehler')
-                logger.error(f"Service Center Löschung fehlgeschlagen für {eui}: {error_msg}")
-                return {
-                    'success': False,
-                    'message': f'Service Center Löschung fehlgeschlagen: {error_msg}'
-                }
-                
-        except Exception as e:
-            error_msg = f"Fehler bei Service Center Löschung für {eui}: {str(e)}"
-            logger.error(error_msg)
-            return {
-                'success': False,
-                'message': error_msg
-            }
+        return self._command('DELETE', f'/api/sensors/{eui}', 'Löschung',
+                             f'Sensor {eui} erfolgreich vom Service Center gelöscht', eui=eui)
     
     def detach_sensor(self, eui: str) -> Dict[str, Any]:
         """
@@ -218,35 +359,8 @@ class ServiceCenterClient:
         Returns:
             Dict mit Ergebnis der Operation
         """
-        try:
-            response = self.session.post(
-                f"{self.base_url}/api/sensors/{eui}/detach",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('success'):
-                logger.info(f"Sensor {eui} vom Service Center getrennt")
-                return {
-                    'success': True,
-                    'message': f'Sensor {eui} erfolgreich getrennt'
-                }
-            else:
-                error_msg = result.get('message', 'Unbekannter Fehler')
-                logger.error(f"Service Center Trennung fehlgeschlagen für {eui}: {error_msg}")
-                return {
-                    'success': False,
-                    'message': f'Service Center Trennung fehlgeschlagen: {error_msg}'
-                }
-                
-        except Exception as e:
-            error_msg = f"Fehler bei Service Center Trennung für {eui}: {str(e)}"
-            logger.error(error_msg)
-            return {
-                'success': False,
-                'message': error_msg
-            }
+        return self._command('POST', f'/api/sensors/{eui}/detach', 'Trennung',
+                             f'Sensor {eui} erfolgreich getrennt', eui=eui)
     
     def attach_all_sensors(self) -> Dict[str, Any]:
         """
@@ -255,36 +369,8 @@ class ServiceCenterClient:
         Returns:
             Dict mit Ergebnis der Operation
         """
-        try:
-            response = self.session.post(
-                f"{self.base_url}/api/sensors/attach-all",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('success'):
-                message = result.get('message', 'Alle Sensoren verbunden')
-                logger.info(f"Service Center: {message}")
-                return {
-                    'success': True,
-                    'message': message
-                }
-            else:
-                error_msg = result.get('message', 'Unbekannter Fehler')
-                logger.error(f"Service Center Attach-All fehlgeschlagen: {error_msg}")
-                return {
-                    'success': False,
-                    'message': f'Attach-All fehlgeschlagen: {error_msg}'
-                }
-                
-        except Exception as e:
-            error_msg = f"Fehler bei Service Center Attach-All: {str(e)}"
-            logger.error(error_msg)
-            return {
-                'success': False,
-                'message': error_msg
-            }
+        return self._command('POST', '/api/sensors/attach-all', 'Attach-All',
+                             'Alle Sensoren verbunden', server_message=True)
     
     def detach_all_sensors(self) -> Dict[str, Any]:
         """
@@ -293,36 +379,8 @@ class ServiceCenterClient:
         Returns:
             Dict mit Ergebnis der Operation
         """
-        try:
-            response = self.session.post(
-                f"{self.base_url}/api/sensors/detach-all",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('success'):
-                message = result.get('message', 'Alle Sensoren getrennt')
-                logger.info(f"Service Center: {message}")
-                return {
-                    'success': True,
-                    'message': message
-                }
-            else:
-                error_msg = result.get('message', 'Unbekannter Fehler')
-                logger.error(f"Service Center Detach-All fehlgeschlagen: {error_msg}")
-                return {
-                    'success': False,
-                    'message': f'Detach-All fehlgeschlagen: {error_msg}'
-                }
-                
-        except Exception as e:
-            error_msg = f"Fehler bei Service Center Detach-All: {str(e)}"
-            logger.error(error_msg)
-            return {
-                'success': False,
-                'message': error_msg
-            }
+        return self._command('POST', '/api/sensors/detach-all', 'Detach-All',
+                             'Alle Sensoren getrennt', server_message=True)
     
     def clear_all_sensors(self) -> Dict[str, Any]:
         """
@@ -331,36 +389,9 @@ class ServiceCenterClient:
         Returns:
             Dict mit Ergebnis der Operation
         """
-        try:
-            response = self.session.post(
-                f"{self.base_url}/api/sensors/clear",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('success'):
-                message = result.get('message', 'Alle Sensoren gelöscht')
-                logger.info(f"Service Center: {message}")
-                return {
-                    'success': True,
-                    'message': message
-                }
-            else:
-                error_msg = result.get('message', 'Unbekannter Fehler')
-                logger.error(f"Service Center Clear-All fehlgeschlagen: {error_msg}")
-                return {
-                    'success': False,
-                    'message': f'Clear-All fehlgeschlagen: {error_msg}'
-                }
-                
-        except Exception as e:
-            error_msg = f"Fehler bei Service Center Clear-All: {str(e)}"
-            logger.error(error_msg)
-            return {
-                'success': False,
-                'message': error_msg
-            }
+        return self._command('POST', '/api/sensors/clear', 'Clear-All',
+                             'Alle Sensoren gelöscht', server_message=True)
+
 
 def create_service_center_client(base_url: str) -> Optional[ServiceCenterClient]:
     """
@@ -379,5 +410,5 @@ def create_service_center_client(base_url: str) -> Optional[ServiceCenterClient]
         client = ServiceCenterClient(base_url.strip())
         return client
     except Exception as e:
-        logger.error(f"Fehler beim Erstellen des Service Center Clients: {e}")
+        logger.error("Fehler beim Erstellen des Service Center Clients: %s", e)
         return None
\ No newline at end of file
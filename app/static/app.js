@@ -0,0 +1,529 @@
+console.log('BASE_URL resolved:', BASE_URL || window.location.origin);
+console.log('Current pathname:', window.location.pathname);
+console.log('Is embedded (iframe):', window.parent !== window);
+
+// Cache-Busting für alle API Calls
+function getCacheBusterURL(path) {
+    const timestamp = Date.now();
+    const random = Math.random();
+    return `${BASE_URL}${path}?cb=${timestamp}&t=${random}`;
+}
+
+// Geräte-Karten aus <template> erzeugen und je EUI wiederverwenden: Aktualisierungen
+// ändern nur Texte, offene Metadaten und laufende Eingaben bleiben erhalten
+function renderDeviceCards(listId, templateId, deviceType, devices, fieldsOf, quickFill) {
+    const list = document.getElementById(listId);
+    const existing = new Map();
+    for (const card of list.children) {
+        if (card.dataset.eui) existing.set(card.dataset.eui, card);
+    }
+    
+    const cards = devices.map(device => {
+        let card = existing.get(device.eui);
+        if (!card) {
+            card = createDeviceCard(templateId, deviceType, device.eui, quickFill);
+        }
+        updateDeviceCard(card, deviceType, device, fieldsOf(device));
+        return card;
+    });
+    
+    // DOM nur bei geänderter Reihenfolge oder Anzahl in einem Schritt neu einhängen
+    const children = list.children;
+    const unchanged = cards.length === children.length && cards.every((card, i) => children[i] === card);
+    if (!unchanged) {
+        list.replaceChildren(...cards);
+    }
+}
+
+function createDeviceCard(templateId, deviceType, eui, quickFill) {
+    const card = document.getElementById(templateId).content.firstElementChild.cloneNode(true);
+    card.dataset.eui = eui;
+    
+    // IDs wie bisher, damit toggleMetadata/saveMetadata/resetMetadata unverändert funktionieren
+    const metadataId = `${deviceType}-${eui}`;
+    card.querySelector('[data-role="metadata"]').id = metadataId;
+    for (const input of card.querySelectorAll('[data-meta]')) {
+        input.id = `${input.dataset.meta}-${eui}`;
+    }
+    
+    card.querySelector('[data-action="toggle"]').addEventListener('click', () => toggleMetadata(metadataId));
+    card.querySelector('[data-action="save"]').addEventListener('click', () => saveMetadata(deviceType, eui));
+    card.querySelector('[data-action="reset"]').addEventListener('click', () => resetMetadata(deviceType, eui));
+    card.querySelector('[data-action="quick-fill"]').addEventListener('click', () => quickFill(eui));
+    return card;
+}
+
+function updateDeviceCard(card, deviceType, device, fields) {
+    for (const element of card.querySelectorAll('[data-field]')) {
+        const value = String(fields[element.dataset.field] ?? '');
+        if (element.textContent !== value) element.textContent = value;
+    }
+    
+    // Eingabefelder nur überschreiben, wenn sich die Metadaten am Server geändert haben
+    const defaultName = deviceType === 'sensor' ? `Sensor ${device.eui}` : `Base Station ${device.eui}`;
+    const metadata = {
+        manufacturer: device.metadata?.manufacturer || 'Unknown',
+        model: device.metadata?.model || 'Unknown',
+        name: device.metadata?.name || defaultName,
+        sw_version: device.metadata?.sw_version || '1.0'
+    };
+    const metadataKey = JSON.stringify(metadata);
+    if (card.dataset.metadata !== metadataKey) {
+        card.dataset.metadata = metadataKey;
+        for (const input of card.querySelectorAll('[data-meta]')) {
+            input.value = metadata[input.dataset.meta];
+        }
+    }
+    
+    card.querySelector('[data-role="needs-metadata"]').style.display = device.needs_metadata ? 'block' : 'none';
+}
+
+// Daten laden
+async function loadSensors() {
+    try {
+        // Revalidierung per ETag statt Cache-Buster: unveränderte Liste kommt als 304
+        const response = await fetch(`${BASE_URL}/api/sensors`, { cache: 'no-cache' });
+        showSensors(await response.json());
+    } catch (error) {
+        console.error('Fehler beim Laden der Sensoren:', error);
+    }
+}
+
+// Sensoren und Base Stations mit einem Request laden (Start, Polling, Wiederverbindung)
+async function loadAll() {
+    try {
+        const response = await fetch(`${BASE_URL}/api/snapshot`, { cache: 'no-cache' });
+        const snapshot = await response.json();
+        showSensors(snapshot.sensors);
+        showBaseStations(snapshot.basestations);
+    } catch (error) {
+        console.error('Fehler beim Laden der Geräte:', error);
+    }
+}
+
+function showSensors(sensors) {
+    document.getElementById('sensor-count').textContent = sensors.length;
+    
+    renderDeviceCards('sensors-list', 'sensor-card-template', 'sensor', sensors, sensor => ({
+        eui: sensor.eui,
+        sensor_type: sensor.sensor_type,
+        last_update: sensor.last_update,
+        snr: sensor.snr || 'N/A',
+        rssi: sensor.rssi || 'N/A',
+        signal_quality: sensor.signal_quality || 'Unknown'
+    }), addManualSensorData);
+}
+
+function addManualSensorData(eui) {
+    // Für bestehende Sensoren
+    if (eui) {
+        const manufacturer = prompt('Hersteller eingeben (z.B. Sentinum, Loriot, etc.):');
+        const model = prompt('Gerätemodell eingeben (z.B. Temperature Sensor v2.1):');
+        
+        if (manufacturer && model) {
+            fetch(`${BASE_URL}/api/sensors/${eui}/metadata`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ manufacturer, model })
+            }).then(response => {
+                if (response.ok) {
+                    alert('✅ Metadaten gespeichert! Auto-Discovery wird beim nächsten Sensor-Update versucht.');
+                    loadSensors(); // Refresh
+                } else {
+                    alert('❌ Fehler beim Speichern der Metadaten');
+                }
+            });
+        }
+    } else {
+        // Demo-Sensor erstellen
+        const sensorEui = prompt('Sensor EUI eingeben (z.B. 1234567890ABCDEF):');
+        if (!sensorEui) return;
+        
+        const manufacturer = prompt('Hersteller eingeben (z.B. Sentinum, Loriot, etc.):');
+        const model = prompt('Gerätemodell eingeben (z.B. Temperature Sensor v2.1):');
+        
+        if (manufacturer && model) {
+            // Demo-Sensor simulieren
+            fetch(`${BASE_URL}/api/sensors/${sensorEui}/metadata`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ manufacturer, model })
+            }).then(response => {
+                if (response.ok) {
+                    alert('✅ Demo-Sensor erstellt! Metadaten gespeichert.');
+                    // Demo-Sensor-Daten simulieren
+                    simulateDemoSensor(sensorEui);
+                } else {
+                    alert('❌ Fehler beim Erstellen des Demo-Sensors');
+                }
+            });
+        }
+    }
+}
+
+function simulateDemoSensor(eui) {
+    // Erstelle einen Demo-Sensor in der UI
+    const now = new Date().toLocaleString();
+    const demoSensor = {
+        eui: eui,
+        sensor_type: 'Demo Sensor',
+        last_update: now,
+        needs_metadata: false // Da wir gerade Metadaten gesetzt haben
+    };
+    
+    // Füge den Demo-Sensor zur Anzeige hinzu
+    const sensorsList = document.getElementById('sensors-list');
+    const sensorHtml = `
+        <div style="background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 8px; border-left: 4px solid #28a745;">
+            <strong>EUI:</strong> ${demoSensor.eui}<br>
+            <strong>Typ:</strong> ${demoSensor.sensor_type}<br>
+            <strong>Letztes Update:</strong> ${demoSensor.last_update}<br>
+            <div style="margin-top: 10px; padding: 8px; background: #d4edda; border-radius: 4px; border-left: 3px solid #28a745;">
+                <small><strong>✅ Demo-Sensor:</strong> Metadaten erfolgreich gesetzt</small>
+            </div>
+        </div>
+    `;
+    sensorsList.insertAdjacentHTML('afterbegin', sensorHtml);
+    
+    // Sensor-Count aktualisieren
+    const currentCount = parseInt(document.getElementById('sensor-count').textContent);
+    document.getElementById('sensor-count').textContent = currentCount + 1;
+}
+
+function addManualBasestationData(eui) {
+    const manufacturer = prompt('Base Station Hersteller eingeben (z.B. Swissphone, Kerlink, etc.):');
+    const model = prompt('Base Station Modell eingeben (z.B. MBS20, Wirnet Station):');
+    
+    if (manufacturer && model) {
+        fetch(`${BASE_URL}/api/basestations/${eui}/metadata`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ manufacturer, model })
+        }).then(response => {
+            if (response.ok) {
+                alert('✅ Base Station Metadaten gespeichert! Auto-Discovery wird beim nächsten Update versucht.');
+                loadBaseStations(); // Refresh
+            } else {
+                alert('❌ Fehler beim Speichern der Base Station Metadaten');
+            }
+        });
+    }
+}
+
+// Metadaten-UI Funktionen
+function toggleMetadata(elementId) {
+    const element = document.getElementById(elementId);
+    if (element.style.display === 'none') {
+        element.style.display = 'block';
+    } else {
+        element.style.display = 'none';
+    }
+}
+
+function saveMetadata(deviceType, eui) {
+    const manufacturer = document.getElementById(`manufacturer-${eui}`).value.trim();
+    const model = document.getElementById(`model-${eui}`).value.trim();
+    const name = document.getElementById(`name-${eui}`).value.trim();
+    const sw_version = document.getElementById(`sw_version-${eui}`).value.trim();
+    
+    if (!manufacturer || !model) {
+        alert('❌ Hersteller und Modell sind erforderlich!');
+        return;
+    }
+    
+    const endpoint = deviceType === 'sensor' ? 
+        `/api/sensors/${eui}/metadata` : 
+        `/api/basestations/${eui}/metadata`;
+    
+    const data = {
+        manufacturer: manufacturer,
+        model: model,
+        name: name,
+        sw_version: sw_version
+    };
+    
+    fetch(`${BASE_URL}${endpoint}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    }).then(response => {
+        if (response.ok) {
+            alert('✅ Metadaten erfolgreich gespeichert!');
+            // Lade Daten neu
+            if (deviceType === 'sensor') {
+                loadSensors();
+            } else {
+                loadBaseStations();
+            }
+        } else {
+            alert('❌ Fehler beim Speichern der Metadaten');
+        }
+    }).catch(error => {
+        console.error('Fehler beim Speichern:', error);
+        alert('❌ Fehler beim Speichern der Metadaten');
+    });
+}
+
+function resetMetadata(deviceType, eui) {
+    if (confirm('Möchten Sie die Metadaten wirklich zurücksetzen?')) {
+        document.getElementById(`manufacturer-${eui}`).value = 'Unknown';
+        document.getElementById(`model-${eui}`).value = 'Unknown';
+        document.getElementById(`name-${eui}`).value = deviceType === 'sensor' ? `Sensor ${eui}` : `Base Station ${eui}`;
+        document.getElementById(`sw_version-${eui}`).value = '1.0';
+        
+        alert('🔄 Metadaten zurückgesetzt. Klicken Sie auf "💾" zum Speichern.');
+    }
+}
+
+async function loadBaseStations() {
+    try {
+        const response = await fetch(`${BASE_URL}/api/basestations`, { cache: 'no-cache' });
+        showBaseStations(await response.json());
+    } catch (error) {
+        console.error('Fehler beim Laden der Base Stations:', error);
+    }
+}
+
+function showBaseStations(basestations) {
+    document.getElementById('basestation-count').textContent = basestations.length;
+    
+    renderDeviceCards('basestations-list', 'basestation-card-template', 'basestation', basestations, bs => ({
+        eui: bs.eui,
+        status: bs.status,
+        last_update: bs.last_update,
+        cpu_usage: bs.cpu_usage || 'N/A',
+        memory_usage: bs.memory_usage || 'N/A'
+    }), addManualBasestationData);
+}
+
+// HOME ASSISTANT INGRESS CACHE-BUSTING LÖSUNG
+function addCacheBuster(url) {
+    const separator = url.includes('?') ? '&' : '?';
+    return url + separator + 'cb=' + Date.now() + '&t=' + Math.random();
+}
+
+// Erkenne Home Assistant Ingress Environment
+const isHomeAssistantIngress = window.location.pathname.includes('/api/hassio_ingress/') || 
+                              document.referrer.includes('homeassistant') || 
+                              window.parent !== window;
+
+// Global Navigation Function für alle Umgebungen
+window.navigateTo = function(path) {
+    console.log('🔗 Navigation zu:', path);
+    const url = `${BASE_URL}${path}?t=${Date.now()}&cb=${Math.random()}`;
+    console.log('🚀 Navigation URL:', url);
+    window.location.href = url;
+};
+
+if (isHomeAssistantIngress) {
+    console.log('🏠 HOME ASSISTANT INGRESS ERKANNT - Aggressive Cache-Busting aktiviert!');
+    
+    // Überschreibe fetch mit automatischem Cache-Busting
+    const originalFetch = window.fetch;
+    window.fetch = function(url, options = {}) {
+        // Eigene Cache-Strategie des Aufrufers (z.B. 'no-cache' für ETag/304) nicht überschreiben
+        if (options.cache) {
+            return originalFetch(url, options);
+        }
+        if (typeof url === 'string' && (url.startsWith('/api/') || url.startsWith('${BASE_URL}/api/'))) {
+            url = addCacheBuster(url);
+            console.log('🚀 HA Cache-Buster URL:', url);
+        }
+        // Aggressive no-cache headers für Home Assistant
+        options.cache = 'no-store';
+        options.headers = {
+            ...options.headers,
+            'Cache-Control': 'no-cache, no-store, must-revalidate',
+            'Pragma': 'no-cache',
+            'Expires': '0',
+            'X-Requested-With': 'XMLHttpRequest'
+        };
+        return originalFetch(url, options);
+    };
+}
+
+// Auto-refresh mit verbessertem Error-Handling
+function startAutoRefresh() {
+    loadAll();
+    
+    // Polling nur solange kein Event-Stream verbunden ist
+    let pollTimer = null;
+    const startPolling = () => {
+        if (!pollTimer) {
+            pollTimer = setInterval(loadAll, 30000);
+        }
+    };
+    
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    
+    // Server-Sent Events: Add-on meldet Änderungen, Listen werden nur dann neu geladen
+    const events = new EventSource(`${BASE_URL}/api/stream`);
+    events.addEventListener('sensors', loadSensors);
+    events.addEventListener('basestations', loadBaseStations);
+    events.onopen = () => {
+        if (pollTimer) {
+            clearInterval(pollTimer);
+            pollTimer = null;
+            // Während der Unterbrechung verpasste Änderungen nachladen
+            loadAll();
+        }
+    };
+    events.onerror = startPolling;
+}
+
+// SENSOR REGISTRATION MODAL FUNCTIONS
+function showSensorRegistrationModal() {
+    document.getElementById('sensorRegistrationModal').style.display = 'block';
+}
+
+function closeSensorRegistrationModal() {
+    document.getElementById('sensorRegistrationModal').style.display = 'none';
+    document.getElementById('sensorRegistrationForm').reset();
+    clearValidationErrors();
+}
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+    const modal = document.getElementById('sensorRegistrationModal');
+    if (event.target === modal) {
+        closeSensorRegistrationModal();
+    }
+}
+
+// HEX VALIDATION FUNCTIONS
+function isValidHex(value, length) {
+    const hexPattern = new RegExp(`^[0-9A-Fa-f]{${length}}$`);
+    return hexPattern.test(value);
+}
+
+function validateForm() {
+    clearValidationErrors();
+    let isValid = true;
+
+    const eui = document.getElementById('sensor_eui').value.trim();
+    const networkKey = document.getElementById('network_key').value.trim();
+    const shortAddr = document.getElementById('short_addr').value.trim();
+
+    // EUI Validation (16 hex characters)
+    if (!eui) {
+        showFieldError('sensor_eui', 'EUI ist erforderlich');
+        isValid = false;
+    } else if (!isValidHex(eui, 16)) {
+        showFieldError('sensor_eui', 'EUI muss genau 16 Hexadezimal-Zeichen enthalten');
+        isValid = false;
+    }
+
+    // Network Key Validation (32 hex characters)
+    if (!networkKey) {
+        showFieldError('network_key', 'Network Key ist erforderlich');
+        isValid = false;
+    } else if (!isValidHex(networkKey, 32)) {
+        showFieldError('network_key', 'Network Key muss genau 32 Hexadezimal-Zeichen enthalten');
+        isValid = false;
+    }
+
+    // Short Address Validation (4 hex characters)
+    if (!shortAddr) {
+        showFieldError('short_addr', 'Short Address ist erforderlich');
+        isValid = false;
+    } else if (!isValidHex(shortAddr, 4)) {
+        showFieldError('short_addr', 'Short Address muss genau 4 Hexadezimal-Zeichen enthalten');
+        isValid = false;
+    }
+
+    return isValid;
+}
+
+function showFieldError(fieldId, message) {
+    const field = document.getElementById(fieldId);
+    field.classList.add('error');
+    
+    // Remove existing error message
+    const existingError = field.parentNode.querySelector('.error-message');
+    if (existingError) {
+        existingError.remove();
+    }
+    
+    // Add new error message
+    const errorDiv = document.createElement('div');
+    errorDiv.className = 'error-message';
+    errorDiv.textContent = message;
+    field.parentNode.appendChild(errorDiv);
+}
+
+function clearValidationErrors() {
+    document.querySelectorAll('.error').forEach(field => {
+        field.classList.remove('error');
+    });
+    document.querySelectorAll('.error-message').forEach(msg => {
+        msg.remove();
+    });
+}
+
+// FORM SUBMISSION
+document.getElementById('sensorRegistrationForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    
+    if (!validateForm()) {
+        return;
+    }
+
+    const submitBtn = document.querySelector('.submit-btn');
+    const originalText = submitBtn.textContent;
+    
+    try {
+        submitBtn.disabled = true;
+        submitBtn.textContent = '⏳ Wird registriert...';
+
+        const formData = new FormData(this);
+        const data = Object.fromEntries(formData.entries());
+        
+        // Convert bidirectional to boolean
+        data.bidirectional = data.bidirectional === 'true';
+
+        console.log('🚀 Registriere Sensor:', data);
+
+        const response = await fetch(getCacheBusterURL('/api/sensor/register'), {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            alert('✅ Sensor erfolgreich registriert!');
+            closeSensorRegistrationModal();
+            // Refresh sensor list
+            loadSensors();
+        } else {
+            alert('❌ Fehler bei der Registrierung: ' + (result.error || 'Unbekannter Fehler'));
+        }
+    } catch (error) {
+        console.error('Registration error:', error);
+        alert('❌ Netzwerkfehler bei der Registrierung');
+    } finally {
+        submitBtn.disabled = false;
+        submitBtn.textContent = originalText;
+    }
+});
+
+// AUTO-FORMATTING FOR HEX FIELDS
+document.getElementById('sensor_eui').addEventListener('input', function(e) {
+    e.target.value = e.target.value.toUpperCase().replace(/[^0-9A-F]/g, '');
+});
+
+document.getElementById('network_key').addEventListener('input', function(e) {
+    e.target.value = e.target.value.toLowerCase().replace(/[^0-9a-f]/g, '');
+});
+
+document.getElementById('short_addr').addEventListener('input', function(e) {
+    e.target.value = e.target.value.toUpperCase().replace(/[^0-9A-F]/g, '');
+});
+
+document.addEventListener('DOMContentLoaded', startAutoRefresh);
@@ -3,16 +3,134 @@ Web GUI für BSSCI mioty Add-on
 Flask-basierte Benutzeroberfläche für Sensor-Management
 """
 
+import gzip
+import hashlib
+import itertools
 import logging
 import json
 import os
+import queue
+import re
+import threading
 import time
 from typing import Any, Dict
-from flask import Flask, render_template, render_template_string, request, jsonify, redirect, url_for
-from flask_cors import CORS
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
+import json_compat
+from json_compat import ORJSON_AVAILABLE, orjson
+from payload_decoder import payload_hex
 from settings_manager import SettingsManager
 from service_center_api import create_service_center_client, ServiceCenterClient
 
+# waitress als WSGI-Server (optional, sonst Werkzeug-Entwicklungsserver)
+try:
+    from waitress import serve as waitress_serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    waitress_serve = None
+    WAITRESS_AVAILABLE = False
+
+# Flask-Compress für gzip/brotli-komprimierte Antworten (optional)
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    Compress = None
+    COMPRESS_AVAILABLE = False
+
+# brotli für vorkomprimierte HTML-Seiten (optional, sonst nur gzip)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON-Provider auf Basis von orjson.
+    
+    Verhalten wie der Standard-Provider: sort_keys und compact werden beachtet,
+    Datumswerte laufen über Flasks default() (HTTP-Datum).
+    """
+    
+    _OPTIONS = ((orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                 | orjson.OPT_SERIALIZE_NUMPY)
+                if ORJSON_AVAILABLE else 0)
+    
+    def _dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        option = self._OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs.keys() - {'indent', 'separators'}:
+            # Sonderoptionen von json.dumps: Standard-Provider verwenden
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj, bool(kwargs.get('indent'))).decode('utf-8')
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumps_bytes(obj, indent) + b"\n",
+                                        mimetype=self.mimetype)
+
+# Maximale Anzahl gerenderter Seiten im Cache (je Seite, Template-Stand und Ingress-Pfad)
+PAGE_CACHE_SIZE = 32
+
+# Server-Sent Events: Bündelungsfenster für Änderungen und Keepalive-Intervall (Sekunden)
+EVENT_STREAM_COALESCE = 1.0
+EVENT_STREAM_KEEPALIVE = 15.0
+
+# CORS-Header sind für das Add-on konstant (jede Herkunft, keine Credentials)
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+CORS_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Methods': 'GET, POST, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Cache-Control, Pragma',
+    'Access-Control-Max-Age': '86400',
+}
+
+# Statische Dateien mit Versions-Parameter ändern sich nie (neue Version = neue URL)
+STATIC_MAX_AGE = 31536000
+
+# Hex-Validierung der Sensor-Felder je Länge (EUI, Network Key, Short Address)
+_HEX_MATCHERS = {length: re.compile(f'[0-9A-Fa-f]{{{length}}}').fullmatch for length in (4, 16, 32)}
+
+
+def _is_valid_hex(value, length):
+    """Validiert Hexadezimal-String mit spezifischer Länge."""
+    return isinstance(value, str) and _HEX_MATCHERS[length](value) is not None
+
+
+def _read_json_object():
+    """Liest den Request-Body als JSON-Objekt.
+    
+    Parst die Bytes direkt (ohne Zwischen-String) und ohne den Body oder das
+    Ergebnis am Request zu cachen. Gibt None zurück, wenn der Body fehlt,
+    ungültig ist oder kein Objekt enthält.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    try:
+        data = json_compat.loads(raw)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+# Worker-Threads des WSGI-Servers; jeder offene Event-Stream belegt einen davon
+WEB_SERVER_THREADS = 16
+EVENT_STREAM_MAX_CLIENTS = 8
+
 
 class WebGUI:
     """Web-Benutzeroberfläche für das Add-on."""
@@ -31,16 +149,61 @@ class WebGUI:
         self.settings = SettingsManager(settings_path)
         logging.info(f"🔧 WEB GUI SETTINGS PFAD: {settings_path}")
         
+        # Service Center Client (Session mit Verbindungspool) über Requests hinweg wiederverwenden
+        self._service_center_client = None
+        
+        # Fertig gerenderte (und vorkomprimierte) HTML-Seiten; einziger variabler Teil ist der Ingress-Pfad
+        self._page_cache: Dict[tuple, Dict[str, bytes]] = {}
+        
+        # Serialisierte Antworten von /api/sensors und /api/basestations: kind -> (version, body, etag)
+        self._snapshots: Dict[str, tuple] = {}
+        self._snapshot_versions: Dict[str, int] = {}
+        self._snapshot_counter = itertools.count(1)
+        
+        # Einmal kompilierte Jinja-Templates der eingebetteten Seiten (Einstellungen, Decoder)
+        self._compiled_templates: Dict[str, Any] = {}
+        
+        # Inhalts-Hash der statischen Dateien für Cache-Busting: name -> (mtime_ns, version)
+        self._asset_versions: Dict[str, tuple] = {}
+        
+        # Warteschlangen der verbundenen Event-Stream-Clients (/api/stream)
+        self._event_clients = set()
+        self._event_clients_lock = threading.Lock()
+        
         # KRITISCH: Korrekter Template-Pfad für app/templates/
         template_path = os.path.join(os.path.dirname(__file__), 'templates')
-        self.app = Flask(__name__, template_folder=template_path)
+        static_path = os.path.join(os.path.dirname(__file__), 'static')
+        self.app = Flask(__name__, template_folder=template_path, static_folder=static_path)
+        if ORJSON_AVAILABLE:
+            self.app.json = OrjsonProvider(self.app)
+        # API-Antworten kompakt und ohne Key-Sortierung (auch im Debug-Modus)
+        self.app.json.compact = True
+        self.app.json.sort_keys = False
         
         # KRITISCH: Flask Template-Caching deaktivieren
         self.app.config['TEMPLATES_AUTO_RELOAD'] = True
         self.app.jinja_env.auto_reload = True
         self.app.jinja_env.cache = {}
         
-        CORS(self.app)
+        @self.app.after_request
+        def add_cors_headers(response):
+            """Setze die festen CORS-Header (Preflight über Flasks automatische OPTIONS-Antwort)."""
+            response.headers.update(CORS_HEADERS)
+            if request.method == 'OPTIONS':
+                response.headers.update(CORS_PREFLIGHT_HEADERS)
+            return response
+        
+        @self.app.after_request
+        def invalidate_snapshots(response):
+            """Änderungen über die Web-GUI (z.B. Decoder-Zuordnung) verwerfen die JSON-Snapshots."""
+            if request.method in ('POST', 'PUT', 'DELETE'):
+                self._invalidate_snapshots()
+            return response
+        
+        if COMPRESS_AVAILABLE:
+            # HTML, CSS, JS und JSON komprimieren (text/event-stream ist ausgenommen)
+            self.app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+            Compress(self.app)
         
         # Erweiterte HTTP-Protokollierung aktivieren
         self.setup_logging()
@@ -91,15 +254,20 @@ class WebGUI:
                          'hassio_ingress' in request.headers.get('Referer', '') or
                          'homeassistant' in request.headers.get('User-Agent', '').lower())
             
-            if hasattr(request, 'path') and request.path and (request.path.endswith(('.html', '.css', '.js')) or request.path in ['/', '/settings', '/decoders']):
+            if request.path.startswith('/static/'):
+                if request.args.get('v') and response.status_code in (200, 304):
+                    # Versionierte URL: Inhalt ändert sich nie, Browser muss nicht nachfragen
+                    response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+                else:
+                    response.headers['Cache-Control'] = 'no-cache'
+            elif hasattr(request, 'path') and request.path and (request.path.endswith(('.html', '.css', '.js')) or request.path in ['/', '/settings', '/decoders']):
                 response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0, private'
                 response.headers['Pragma'] = 'no-cache'
                 response.headers['Expires'] = '0'
                 response.headers['X-Frame-Options'] = 'SAMEORIGIN'
-                response.headers['Vary'] = '*'
-                # Eindeutige ETag für jeden Request
-                import time
-                response.headers['ETag'] = f'"{int(time.time() * 1000)}"'
+                # Ergänzen statt überschreiben: vorkomprimierte Seiten tragen Vary: Accept-Encoding.
+                # Kein ETag - mit no-store gibt es ohnehin nichts zu revalidieren.
+                response.vary.add('*')
                 
                 # Extra Headers für Home Assistant Ingress
                 if is_ingress:
@@ -184,10 +352,15 @@ class WebGUI:
             # DEBUGGING: Template-Auswahl protokollieren
             template_path = self.app.template_folder
             index_exists = False
+            index_mtime = None
             try:
-                import os
                 index_file = os.path.join(template_path, 'index.html')
-                index_exists = os.path.exists(index_file)
+                try:
+                    # Änderungszeit kennzeichnet den Template-Stand für den Seiten-Cache
+                    index_mtime = os.stat(index_file).st_mtime_ns
+                    index_exists = True
+                except OSError:
+                    index_exists = False
                 logging.info(f"🔍 TEMPLATE DEBUGGING:")
                 logging.info(f"   Template Folder: {template_path}")
                 logging.info(f"   Index.html exists: {index_exists}")
@@ -198,7 +371,11 @@ class WebGUI:
             # KRITISCH: Verwende IMMER die aktuelle externe Template-Datei
             if index_exists:
                 logging.info("✅ Verwende AKTUELLE index.html Template-Datei (Version 1.0.5.0)")
-                return render_template('index.html', ingress_path=ingress_path)
+                asset_versions = {name: self._asset_version(name) for name in ('style.css', 'app.js')}
+                return self._render_page(
+                    ('index', index_mtime, ingress_path, tuple(asset_versions.values())),
+                    lambda: render_template('index.html', ingress_path=ingress_path,
+                                            asset_versions=asset_versions))
             else:
                 logging.error("❌ CRITICAL ERROR: index.html Template-Datei nicht gefunden!")
                 logging.error("   Template Fallback wurde entfernt um veraltete Versionen zu verhindern")
@@ -215,7 +392,10 @@ class WebGUI:
             logging.info(f"   X-Ingress-Path: {ingress_path}")
             logging.info(f"   Request URL: {request.url}")
             
-            return render_template_string(self.get_settings_template(), ingress_path=ingress_path)
+            return self._render_page(
+                ('settings', ingress_path),
+                lambda: render_template(self._compiled_template('settings', self.get_settings_template),
+                                        ingress_path=ingress_path))
         
         @self.app.route('/decoders')
         def decoders():
@@ -228,7 +408,10 @@ class WebGUI:
             logging.info(f"   X-Ingress-Path: {ingress_path}")
             logging.info(f"   Request URL: {request.url}")
             
-            return render_template_string(self.get_decoders_template(), ingress_path=ingress_path)
+            return self._render_page(
+                ('decoders', ingress_path),
+                lambda: render_template(self._compiled_template('decoders', self.get_decoders_template),
+                                        ingress_path=ingress_path))
         
         @self.app.route('/api/sensors')
         def get_sensors():
@@ -236,41 +419,46 @@ class WebGUI:
             if not self.addon:
                 return jsonify({"error": "Add-on nicht verfügbar"}), 500
             
-            sensors_dict = self.addon.get_sensor_list()
-            
-            # Konvertiere Dictionary zu Liste für Frontend
-            sensor_list = []
-            for eui, data in sensors_dict.items():
-                # Prüfe ob Auto-Discovery Device-Metadaten fehlen
-                needs_metadata = False
-                if hasattr(self.addon, 'decoder_manager') and self.addon.decoder_manager:
-                    device_info = self.addon._get_device_info_from_decoder(eui, f"mioty_{eui}")
-                    needs_metadata = device_info.get('manufacturer') == 'Unknown'
-                
-                # Hole aktuelle Metadaten für UI
-                metadata = {}
-                if hasattr(self.addon, '_get_device_info_from_decoder'):
-                    device_info = self.addon._get_device_info_from_decoder(eui, f"mioty_{eui}")
-                    metadata = {
-                        'manufacturer': device_info.get('manufacturer', 'Unknown'),
-                        'model': device_info.get('model', 'Unknown'),
-                        'name': device_info.get('name', f'Sensor {eui}'),
-                        'sw_version': device_info.get('sw_version', '1.0')
-                    }
-
-                sensor_info = {
-                    'eui': eui,
-                    'sensor_type': 'mioty IoT Sensor',
-                    'last_update': self._format_timestamp(data.get('last_seen', 0)),
-                    'snr': data.get('data', {}).get('snr', 'N/A'),
-                    'rssi': data.get('data', {}).get('rssi', 'N/A'),
-                    'signal_quality': data.get('signal_quality', 'Unknown'),
-                    'needs_metadata': needs_metadata,
-                    'metadata': metadata
-                }
-                sensor_list.append(sensor_info)
+            return self._snapshot_json('sensors', self._sensor_list)
+        
+        @self.app.route('/api/stream')
+        def event_stream():
+            """API: Server-Sent Events bei geänderten Sensor-/Base Station-Daten."""
+            client_queue = queue.Queue(maxsize=16)
+            with self._event_clients_lock:
+                if len(self._event_clients) >= EVENT_STREAM_MAX_CLIENTS:
+                    # Browser fällt bei Fehlerstatus auf Polling zurück
+                    return jsonify({"error": "Zu viele Event-Streams"}), 503
+                self._event_clients.add(client_queue)
             
-            return jsonify(sensor_list)
+            def generate():
+                try:
+                    yield "retry: 5000\n\n"
+                    while True:
+                        try:
+                            kinds = {client_queue.get(timeout=EVENT_STREAM_KEEPALIVE)}
+                        except queue.Empty:
+                            # Kommentarzeile hält Proxy-Verbindungen offen und erkennt getrennte Clients
+                            yield ": keepalive\n\n"
+                            continue
+                        
+                        # Schnell aufeinanderfolgende Uplinks zu einem Event je Art bündeln
+                        time.sleep(EVENT_STREAM_COALESCE)
+                        while True:
+                            try:
+                                kinds.add(client_queue.get_nowait())
+                            except queue.Empty:
+                                break
+                        for kind in sorted(kinds):
+                            yield f"event: {kind}\ndata: {kind}\n\n"
+                finally:
+                    with self._event_clients_lock:
+                        self._event_clients.discard(client_queue)
+            
+            return Response(generate(), mimetype='text/event-stream', headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            })
         
         @self.app.route('/api/basestations')
         def get_basestations():
@@ -278,43 +466,20 @@ class WebGUI:
             if not self.addon:
                 return jsonify({"error": "Add-on nicht verfügbar"}), 500
             
-            basestations_dict = self.addon.get_basestation_list()
-            
-            # Konvertiere Dictionary zu Liste für Frontend
-            bs_list = []
-            for eui, data in basestations_dict.items():
-                # Sichere Zugriffe auf Base Station-Daten
-                status_data = data.get('data', {}) if isinstance(data.get('data'), dict) else {}
-                
-                # Prüfe ob Auto-Discovery Device-Metadaten fehlen
-                needs_metadata = False
-                if hasattr(self.addon, '_get_basestation_info'):
-                    device_info = self.addon._get_basestation_info(eui, f"bssci_basestation_{eui}")
-                    needs_metadata = device_info.get('manufacturer') == 'Unknown'
-                
-                # Hole aktuelle Metadaten für UI
-                metadata = {}
-                if hasattr(self.addon, '_get_basestation_info'):
-                    device_info = self.addon._get_basestation_info(eui, f"bssci_basestation_{eui}")
-                    metadata = {
-                        'manufacturer': device_info.get('manufacturer', 'Unknown'),
-                        'model': device_info.get('model', 'Unknown'),
-                        'name': device_info.get('name', f'Base Station {eui}'),
-                        'sw_version': device_info.get('sw_version', '1.0')
-                    }
-
-                bs_info = {
-                    'eui': eui,
-                    'status': data.get('status', 'Online'),
-                    'last_update': self._format_timestamp(data.get('last_seen', 0)),
-                    'cpu_usage': status_data.get('cpu_usage', 'N/A'),
-                    'memory_usage': status_data.get('memory_usage', 'N/A'),
-                    'needs_metadata': needs_metadata,
-                    'metadata': metadata
-                }
-                bs_list.append(bs_info)
+            return self._snapshot_json('basestations', self._basestation_list)
+        
+        @self.app.route('/api/snapshot')
+        def get_snapshot():
+            """API: Sensoren und Base Stations in einer Antwort (ein Request je Aktualisierung)."""
+            if not self.addon:
+                return jsonify({"error": "Add-on nicht verfügbar"}), 500
             
-            return jsonify(bs_list)
+            # Vorhandene Snapshots nur zusammensetzen, nicht neu serialisieren
+            _, sensors, sensors_etag = self._snapshot('sensors', self._sensor_list)
+            _, basestations, basestations_etag = self._snapshot('basestations', self._basestation_list)
+            body = b'{"sensors":' + sensors + b',"basestations":' + basestations + b'}'
+            etag = hashlib.sha1(f'{sensors_etag}:{basestations_etag}'.encode()).hexdigest()
+            return self._etag_json_response(body, etag)
         
         @self.app.route('/api/status')
         def get_status():
@@ -557,19 +722,15 @@ class WebGUI:
                 logging.error(f"Fehler bei Sensor-Registrierung: {e}")
                 return jsonify({'error': str(e)}), 500
 
-        def _is_valid_hex(value, length):
-            """Validiert Hexadezimal-String mit spezifischer Länge."""
-            import re
-            pattern = f'^[0-9A-Fa-f]{{{length}}}$'
-            return bool(re.match(pattern, value))
-
         @self.app.route('/api/sensor/add', methods=['POST'])
         def add_sensor():
             """API: Neuen Sensor hinzufügen."""
             if not self.addon:
                 return jsonify({"error": "Add-on nicht verfügbar"}), 500
             
-            data = request.get_json()
+            data = _read_json_object()
+            if data is None:
+                return jsonify({"error": "Ungültiger JSON-Body"}), 400
             
             # Validierung
             required_fields = ['sensor_eui', 'network_key', 'short_addr']
@@ -577,6 +738,14 @@ class WebGUI:
                 if field not in data or not data[field]:
                     return jsonify({"error": f"Feld '{field}' ist erforderlich"}), 400
             
+            # Hex-Validierung vor jedem Zugriff auf das Add-on
+            if not _is_valid_hex(data['sensor_eui'], 16):
+                return jsonify({'error': 'EUI muss 16 Hexadezimal-Zeichen enthalten'}), 400
+            if not _is_valid_hex(data['network_key'], 32):
+                return jsonify({'error': 'Network Key muss 32 Hexadezimal-Zeichen enthalten'}), 400
+            if not _is_valid_hex(data['short_addr'], 4):
+                return jsonify({'error': 'Short Address muss 4 Hexadezimal-Zeichen enthalten'}), 400
+            
             # Sensor hinzufügen
             result = self.addon.add_sensor(
                 sensor_eui=data['sensor_eui'],
@@ -596,7 +765,9 @@ class WebGUI:
             if not self.addon:
                 return jsonify({"error": "Add-on nicht verfügbar"}), 500
             
-            data = request.get_json()
+            data = _read_json_object()
+            if data is None:
+                return jsonify({"error": "Ungültiger JSON-Body"}), 400
             
             if 'sensor_eui' not in data:
                 return jsonify({"error": "sensor_eui ist erforderlich"}), 400
@@ -924,6 +1095,7 @@ class WebGUI:
             if not data.get('decoder_name') or not data.get('test_payload'):
                 return jsonify({"error": "decoder_name und test_payload sind erforderlich"}), 400
             
+            test_payload = None
             try:
                 # Konvertiere Hex-String zu Byte-Array
                 if isinstance(data['test_payload'], str):
@@ -940,7 +1112,7 @@ class WebGUI:
                 return jsonify({
                     "decoded": False,
                     "reason": f"Test-Fehler: {str(e)}",
-                    "raw_data": data.get('test_payload', [])
+                    "raw_data": payload_hex(test_payload)
                 })
         
         @self.app.route('/api/decoder/delete', methods=['POST'])
@@ -991,662 +1163,194 @@ class WebGUI:
             adapters = self.addon.decoder_manager.get_iolink_adapters()
             return jsonify({"adapters": adapters})
     
-    def get_main_template(self) -> str:
-        """Hauptseiten-Template - SYNCHRONISIERT mit app/templates/index.html."""
-        return '''
-<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
-    <meta http-equiv="Pragma" content="no-cache">
-    <meta http-equiv="Expires" content="0">
-    <title>mioty Application Center für Homeassistant v1.0.4.6</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #ff6b35 0%, #f7931e 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        
-        .header {
-            background: linear-gradient(135deg, #ff6b35 0%, #f7931e 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .header::before {
-            content: '';
-            position: absolute;
-            top: 50%;
-            right: 30px;
-            transform: translateY(-50%);
-            width: 60px;
-            height: 60px;
-            background-image: url('data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNjAiIGhlaWdodD0iNjAiIHZpZXdCb3g9IjAgMCA2MCA2MCIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KICA8cGF0aCBkPSJNMTUgMTVMMzAgMEw0NSAxNUwzMCAzMFoiIGZpbGw9InJnYmEoMjU1LDI1NSwyNTUsMC4xKSIgc3Ryb2tlPSJyZ2JhKDI1NSwyNTUsMjU1LDAuMikiIHN0cm9rZS13aWR0aD0iMiIvPgogIDxwYXRoIGQ9Ik0wIDMwTDE1IDE1TDMwIDMwTDE1IDQ1WiIgZmlsbD0icmdiYSgyNTUsMjU1LDI1NSwwLjEpIiBzdHJva2U9InJnYmEoMjU1LDI1NSwyNTUsMC4yKSIgc3Ryb2tlLXdpZHRoPSIyIi8+CiAgPHBhdGggZD0iTTMwIDMwTDQ1IDE1TDYwIDMwTDQ1IDQ1WiIgZmlsbD0icmdiYSgyNTUsMjU1LDI1NSwwLjA1KSIgc3Ryb2tlPSJyZ2JhKDI1NSwyNTUsMjU1LDAuMykiIHN0cm9rZS13aWR0aD0iMiIvPgo8L3N2Zz4K');
-            background-size: contain;
-            background-repeat: no-repeat;
-            opacity: 0.15;
-            z-index: 1;
-        }
-        
-        .nav {
-            background: #6c757d;
-            padding: 0;
-            display: flex;
-            justify-content: center;
-        }
-        
-        .nav-item {
-            color: white;
-            text-decoration: none;
-            padding: 15px 30px;
-            display: block;
-            transition: background-color 0.3s ease;
-        }
-        
-        .nav-item:hover, .nav-item.active {
-            background: #ff6b35;
-            color: white;
-            text-decoration: none;
-        }
-        
-        .header h1 {
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 15px;
-        }
-        
-        .logo-icon {
-            font-size: 0.8em;
-            background: rgba(255,255,255,0.2);
-            padding: 10px 12px;
-            border-radius: 50%;
-            backdrop-filter: blur(10px);
-        }
-        
-        .nav-icon {
-            font-size: 1.2em;
-            margin-right: 8px;
-            opacity: 0.8;
-        }
-        
-        .section-icon {
-            display: inline-block;
-            width: 24px;
-            height: 24px;
-            background: linear-gradient(135deg, #ff6b35 0%, #f7931e 100%);
-            color: white;
-            text-align: center;
-            line-height: 24px;
-            border-radius: 50%;
-            margin-right: 12px;
-            font-size: 14px;
-            font-weight: bold;
-        }
-        
-        .header p {
-            font-size: 1.2em;
-            opacity: 0.9;
-        }
-        
-        .content {
-            padding: 30px;
-        }
-        
-        .section {
-            margin-bottom: 40px;
-        }
-        
-        .section h2 {
-            color: #333;
-            border-bottom: 3px solid #ff6b35;
-            padding-bottom: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        .form-group label {
-            display: block;
-            font-weight: 600;
-            margin-bottom: 5px;
-            color: #555;
-        }
+    def notify_change(self, kind: str):
+        """Melde geänderte Daten ('sensors' oder 'basestations') an verbundene Browser."""
+        self._invalidate_snapshots(kind)
+        with self._event_clients_lock:
+            clients = list(self._event_clients)
+        for client_queue in clients:
+            try:
+                client_queue.put_nowait(kind)
+            except queue.Full:
+                # Client hat bereits ausstehende Änderungen und lädt ohnehin neu
+                pass
+    
+    def _sensor_list(self) -> list:
+        """Sensor-Liste für /api/sensors (Frontend-Format)."""
+        sensors_dict = self.addon.get_sensor_list()
+        
+        # Konvertiere Dictionary zu Liste für Frontend
+        sensor_list = []
+        for eui, data in sensors_dict.items():
+            # Prüfe ob Auto-Discovery Device-Metadaten fehlen
+            needs_metadata = False
+            if hasattr(self.addon, 'decoder_manager') and self.addon.decoder_manager:
+                device_info = self.addon._get_device_info_from_decoder(eui, f"mioty_{eui}")
+                needs_metadata = device_info.get('manufacturer') == 'Unknown'
+            
+            # Hole aktuelle Metadaten für UI
+            metadata = {}
+            if hasattr(self.addon, '_get_device_info_from_decoder'):
+                device_info = self.addon._get_device_info_from_decoder(eui, f"mioty_{eui}")
+                metadata = {
+                    'manufacturer': device_info.get('manufacturer', 'Unknown'),
+                    'model': device_info.get('model', 'Unknown'),
+                    'name': device_info.get('name', f'Sensor {eui}'),
+                    'sw_version': device_info.get('sw_version', '1.0')
+                }
+
+            sensor_info = {
+                'eui': eui,
+                'sensor_type': 'mioty IoT Sensor',
+                'last_update': self._format_timestamp(data.get('last_seen', 0)),
+                'snr': data.get('data', {}).get('snr', 'N/A'),
+                'rssi': data.get('data', {}).get('rssi', 'N/A'),
+                'signal_quality': data.get('signal_quality', 'Unknown'),
+                'needs_metadata': needs_metadata,
+                'metadata': metadata
+            }
+            sensor_list.append(sensor_info)
         
-        .form-group input[type="text"] {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            font-size: 16px;
-            transition: border-color 0.3s ease;
-        }
+        return sensor_list
+    
+    def _basestation_list(self) -> list:
+        """Base Station-Liste für /api/basestations (Frontend-Format)."""
+        basestations_dict = self.addon.get_basestation_list()
+        
+        # Konvertiere Dictionary zu Liste für Frontend
+        bs_list = []
+        for eui, data in basestations_dict.items():
+            # Sichere Zugriffe auf Base Station-Daten
+            status_data = data.get('data', {}) if isinstance(data.get('data'), dict) else {}
+            
+            # Prüfe ob Auto-Discovery Device-Metadaten fehlen
+            needs_metadata = False
+            if hasattr(self.addon, '_get_basestation_info'):
+                device_info = self.addon._get_basestation_info(eui, f"bssci_basestation_{eui}")
+                needs_metadata = device_info.get('manufacturer') == 'Unknown'
+            
+            # Hole aktuelle Metadaten für UI
+            metadata = {}
+            if hasattr(self.addon, '_get_basestation_info'):
+                device_info = self.addon._get_basestation_info(eui, f"bssci_basestation_{eui}")
+                metadata = {
+                    'manufacturer': device_info.get('manufacturer', 'Unknown'),
+                    'model': device_info.get('model', 'Unknown'),
+                    'name': device_info.get('name', f'Base Station {eui}'),
+                    'sw_version': device_info.get('sw_version', '1.0')
+                }
+
+            bs_info = {
+                'eui': eui,
+                'status': data.get('status', 'Online'),
+                'last_update': self._format_timestamp(data.get('last_seen', 0)),
+                'cpu_usage': status_data.get('cpu_usage', 'N/A'),
+                'memory_usage': status_data.get('memory_usage', 'N/A'),
+                'needs_metadata': needs_metadata,
+                'metadata': metadata
+            }
+            bs_list.append(bs_info)
         
-        .form-group input[type="text"]:focus {
-            outline: none;
-            border-color: #ff6b35;
-        }
+        return bs_list
+    
+    def _snapshot_json(self, kind: str, build):
+        """JSON-Antwort aus dem Snapshot; unveränderte Daten werden mit 304 beantwortet."""
+        _, body, etag = self._snapshot(kind, build)
+        return self._etag_json_response(body, etag)
+    
+    def _snapshot(self, kind: str, build) -> tuple:
+        """Serialisierter Snapshot (version, body, etag); neu erstellt nur nach einer Änderung.
+        
+        Der Snapshot trägt die Version, mit der er gebaut wurde. Meldet notify_change()
+        während des Aufbaus eine neue Änderung, ist er sofort veraltet und wird beim
+        nächsten Abruf neu erstellt.
+        """
+        version = self._snapshot_versions.get(kind, 0)
+        snapshot = self._snapshots.get(kind)
+        if snapshot is None or snapshot[0] != version:
+            data = build()
+            if ORJSON_AVAILABLE:
+                # Bytes direkt vom Provider, ohne jsonify()-Argumentaufbereitung und str-Umweg
+                body = self.app.json._dumps_bytes(data)
+            else:
+                body = self.app.json.dumps(data).encode('utf-8')
+            snapshot = (version, body, hashlib.sha1(body).hexdigest())
+            self._snapshots[kind] = snapshot
+        return snapshot
+    
+    def _etag_json_response(self, body: bytes, etag: str):
+        """JSON-Bytes mit ETag ausliefern, bei passendem If-None-Match als 304."""
+        response = self.app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        # Browser darf die Antwort nur nach Revalidierung verwenden
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    
+    def _invalidate_snapshots(self, kind: str = None):
+        """Markiere JSON-Snapshots einer Art (oder alle) als veraltet."""
+        for name in ((kind,) if kind else ('sensors', 'basestations')):
+            self._snapshot_versions[name] = next(self._snapshot_counter)
+    
+    def _render_page(self, key: tuple, render) -> Response:
+        """Liefere gerenderte Seite aus dem Cache, rendere nur bei neuem Schlüssel.
+        
+        Neben dem HTML werden gzip- und (falls verfügbar) brotli-Varianten einmalig mit
+        höchster Stufe erzeugt und je nach Accept-Encoding ausgeliefert.
+        """
+        variants = self._page_cache.get(key)
+        if variants is None:
+            html = render().encode('utf-8')
+            variants = {'identity': html, 'gzip': gzip.compress(html, 9)}
+            if BROTLI_AVAILABLE:
+                variants['br'] = brotli.compress(html, quality=11)
+            if len(self._page_cache) >= PAGE_CACHE_SIZE:
+                # Unbekannte Ingress-Pfade dürfen den Cache nicht unbegrenzt wachsen lassen
+                self._page_cache.clear()
+            self._page_cache[key] = variants
+        
+        encoding = request.accept_encodings.best_match([e for e in ('br', 'gzip') if e in variants])
+        response = Response(variants[encoding or 'identity'], mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    def _compiled_template(self, name: str, source):
+        """Kompiliere ein eingebettetes Template nur beim ersten Aufruf."""
+        template = self._compiled_templates.get(name)
+        if template is None:
+            template = self._compiled_templates[name] = self.app.jinja_env.from_string(source())
+        return template
+    
+    def _asset_version(self, name: str) -> str:
+        """Kurzer Inhalts-Hash einer statischen Datei (neu berechnet nur nach Änderung)."""
+        path = os.path.join(self.app.static_folder, name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return '0'
+        cached = self._asset_versions.get(name)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                cached = (mtime, hashlib.sha1(f.read()).hexdigest()[:12])
+            self._asset_versions[name] = cached
+        return cached[1]
+    
+    # Service Center API Integration
+    def _get_service_center_client(self):
+        """Hole Service Center Client basierend auf Settings (neu nur bei geänderter URL)."""
+        settings = self.settings.get_settings()
+        service_center_url = settings.get('service_center_url', '').strip()
         
-        .form-group input[type="checkbox"] {
-            transform: scale(1.2);
-            margin-right: 10px;
-        }
+        if not service_center_url or not settings.get('service_center_enabled', False):
+            return None
         
-        .btn {
-            background: linear-gradient(135deg, #ff6b35 0%, #f7931e 100%);
-            color: white;
-            border: none;
-            padding: 12px 24px;
-            border-radius: 8px;
-            font-size: 16px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: transform 0.2s ease;
-            margin-right: 10px;
-        }
-        
-        .btn:hover {
-            transform: translateY(-2px);
-        }
-        
-        .btn-danger {
-            background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
-        }
-        
-        .sensor-list {
-            display: grid;
-            gap: 20px;
-        }
-        
-        .sensor-card {
-            border: 2px solid #eee;
-            border-radius: 12px;
-            padding: 20px;
-            transition: border-color 0.3s ease;
-        }
-        
-        .sensor-card:hover {
-            border-color: #ff6b35;
-        }
-        
-        .sensor-header {
-            display: flex;
-            justify-content: between;
-            align-items: center;
-            margin-bottom: 15px;
-        }
-        
-        .sensor-eui {
-            font-family: monospace;
-            font-size: 1.2em;
-            font-weight: 600;
-            color: #333;
-        }
-        
-        .sensor-status {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        
-        .status-indicator {
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background: #4CAF50;
-        }
-        
-        .sensor-details {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-bottom: 15px;
-        }
-        
-        .detail-item {
-            display: flex;
-            flex-direction: column;
-        }
-        
-        .detail-label {
-            font-weight: 600;
-            color: #666;
-            font-size: 0.9em;
-            margin-bottom: 5px;
-        }
-        
-        .detail-value {
-            color: #333;
-            font-family: monospace;
-        }
-        
-        .alert {
-            padding: 15px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-        }
-        
-        .alert-success {
-            background: #d4edda;
-            color: #155724;
-            border: 1px solid #c3e6cb;
-        }
-        
-        .alert-error {
-            background: #f8d7da;
-            color: #721c24;
-            border: 1px solid #f5c6cb;
-        }
-        
-        .loading {
-            text-align: center;
-            padding: 40px;
-            color: #666;
-        }
-        
-        @media (max-width: 768px) {
-            .container {
-                margin: 10px;
-                border-radius: 10px;
-            }
-            
-            .content {
-                padding: 20px;
-            }
-            
-            .sensor-details {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1><span class="logo-icon">⚡</span> mioty Application Center</h1>
-            <p>für Home Assistant <span style="opacity: 0.6; font-size: 0.8em;">• powered by Sentinum</span></p>
-        </div>
-        
-        <div class="nav">
-            <a id="nav-sensors" href="#" class="nav-item active" onclick="navigateTo('/')"><span class="nav-icon">●</span> Sensoren</a>
-            <a id="nav-decoders" href="#" class="nav-item" onclick="navigateTo('/decoders')"><span class="nav-icon">◆</span> Decoder</a>
-            <a id="nav-settings" href="#" class="nav-item" onclick="navigateTo('/settings')"><span class="nav-icon">▲</span> Einstellungen</a>
-        </div>
-        
-        <div class="content">
-            <div id="alerts"></div>
-            
-            <!-- Sensor hinzufügen -->
-            <div class="section">
-                <h2><span class="section-icon">+</span> Neuen Sensor hinzufügen</h2>
-                <form id="addSensorForm">
-                    <div class="form-group">
-                        <label for="sensor_eui">Sensor EUI (16 Hex-Zeichen):</label>
-                        <input type="text" id="sensor_eui" name="sensor_eui" placeholder="fca84a0300001234" pattern="[0-9a-fA-F]{16}" required>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="network_key">Netzwerk-Schlüssel (32 Hex-Zeichen):</label>
-                        <input type="text" id="network_key" name="network_key" placeholder="0011223344556677889AABBCCDDEEFF00" pattern="[0-9a-fA-F]{32}" required>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="short_addr">Kurze Adresse (4 Hex-Zeichen):</label>
-                        <input type="text" id="short_addr" name="short_addr" placeholder="1234" pattern="[0-9a-fA-F]{4}" required>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label>
-                            <input type="checkbox" id="bidirectional" name="bidirectional">
-                            Bidirektionale Kommunikation aktivieren
-                        </label>
-                    </div>
-                    
-                    <button type="submit" class="btn">Sensor hinzufügen</button>
-                </form>
-            </div>
-            
-            <!-- Sensor-Liste -->
-            <div class="section">
-                <h2><span class="section-icon">●</span> Registrierte Sensoren</h2>
-                <div id="sensorList" class="loading">Lade Sensoren...</div>
-            </div>
-            
-            <!-- Base Station Status -->
-            <div class="section">
-                <h2><span class="section-icon">■</span> Base Stations</h2>
-                <div id="baseStationList" class="loading">Lade Base Stations...</div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        // Use server-provided ingress path from X-Ingress-Path header
-        const INGRESS_PATH = '{{ ingress_path }}' || '';
-        const BASE_URL = INGRESS_PATH || window.location.origin;
-        console.log('Ingress path from server:', INGRESS_PATH);
-        console.log('BASE_URL resolved:', BASE_URL);
-        console.log('Current pathname:', window.location.pathname);
-        console.log('Is embedded (iframe):', window.parent !== window);
-        
-        // HOME ASSISTANT INGRESS CACHE-BUSTING LÖSUNG
-        function addCacheBuster(url) {
-            const separator = url.includes('?') ? '&' : '?';
-            return url + separator + 'cb=' + Date.now() + '&t=' + Math.random();
-        }
-        
-        // Erkenne Home Assistant Ingress Environment  
-        const isHomeAssistantIngress = window.location.pathname.includes('/api/hassio_ingress/') || 
-                                      document.referrer.includes('homeassistant') || 
-                                      window.parent !== window;
-        
-        // IMMER Cache-Busting aktivieren - sowohl für Ingress als auch direkten Zugriff
-        console.log('🔧 UNIVERSAL CACHE-BUSTING AKTIVIERT - Funktioniert für alle Zugriffsmethoden!');
-        if (isHomeAssistantIngress) {
-            console.log('🏠 HOME ASSISTANT INGRESS ERKANNT');
-        } else {
-            console.log('🔗 DIREKTER ZUGRIFF ERKANNT (Port 5000)');
-        }
-        
-        // Überschreibe fetch mit automatischem Cache-Busting
-        const originalFetch = window.fetch;
-        window.fetch = function(url, options = {}) {
-            if (typeof url === 'string' && (url.startsWith('/api/') || url.startsWith(BASE_URL + '/api/'))) {
-                url = addCacheBuster(url);
-                console.log('⚙️ Cache-Buster URL:', url);
-            }
-            // No-cache headers für beide Zugriffsmethoden
-            options.cache = 'no-store';
-            options.headers = {
-                ...options.headers,
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0',
-                'X-Requested-With': 'XMLHttpRequest'
-            };
-            return originalFetch(url, options);
-        };
-        
-        // Simplified navigation for embedded mode
-        const navigateTo = (path) => {
-            const fullUrl = BASE_URL + path;
-            console.log('Navigating to:', fullUrl);
-            console.log('Path requested:', path);
-            
-            // Simple approach - just use window.location.href
-            // This should work in both embedded and direct access
-            window.location.href = fullUrl;
-        };
-        
-        // DOM Elemente
-        const addSensorForm = document.getElementById('addSensorForm');
-        const sensorList = document.getElementById('sensorList');
-        const baseStationList = document.getElementById('baseStationList');
-        const alerts = document.getElementById('alerts');
-        
-        // Sensor-Daten laden
-        async function loadSensors() {
-            try {
-                const response = await fetch(BASE_URL + '/api/sensors');
-                const sensors = await response.json();
-                
-                if (Object.keys(sensors).length === 0) {
-                    sensorList.innerHTML = '<p>Noch keine Sensoren registriert.</p>';
-                    return;
-                }
-                
-                let html = '<div class="sensor-list">';
-                for (const [eui, data] of Object.entries(sensors)) {
-                    html += createSensorCard(eui, data);
-                }
-                html += '</div>';
-                
-                sensorList.innerHTML = html;
-                
-            } catch (error) {
-                sensorList.innerHTML = '<p>Fehler beim Laden der Sensoren.</p>';
-                console.error('Fehler:', error);
-            }
-        }
-        
-        // Base Station Daten laden
-        async function loadBaseStations() {
-            try {
-                const response = await fetch(BASE_URL + '/api/basestations');
-                const stations = await response.json();
-                
-                if (Object.keys(stations).length === 0) {
-                    baseStationList.innerHTML = '<p>Keine Base Stations erkannt.</p>';
-                    return;
-                }
-                
-                let html = '<div class="sensor-list">';
-                for (const [eui, data] of Object.entries(stations)) {
-                    html += createBaseStationCard(eui, data);
-                }
-                html += '</div>';
-                
-                baseStationList.innerHTML = html;
-                
-            } catch (error) {
-                baseStationList.innerHTML = '<p>Fehler beim Laden der Base Stations.</p>';
-                console.error('Fehler:', error);
-            }
-        }
-        
-        // Sensor-Karte erstellen
-        function createSensorCard(eui, data) {
-            const lastSeen = data.last_seen ? new Date(data.last_seen * 1000).toLocaleString() : 'Nie';
-            
-            return `
-                <div class="sensor-card">
-                    <div class="sensor-header">
-                        <div class="sensor-eui">${eui}</div>
-                        <div class="sensor-status">
-                            <div class="status-indicator"></div>
-                            <span>Online</span>
-                        </div>
-                    </div>
-                    
-                    <div class="sensor-details">
-                        <div class="detail-item">
-                            <div class="detail-label">Kurze Adresse</div>
-                            <div class="detail-value">${data.short_addr || 'N/A'}</div>
-                        </div>
-                        
-                        <div class="detail-item">
-                            <div class="detail-label">Bidirektional</div>
-                            <div class="detail-value">${data.bidirectional ? 'Ja' : 'Nein'}</div>
-                        </div>
-                        
-                        <div class="detail-item">
-                            <div class="detail-label">Signalqualität</div>
-                            <div class="detail-value">${data.signal_quality || 'Unbekannt'}</div>
-                        </div>
-                        
-                        <div class="detail-item">
-                            <div class="detail-label">Zuletzt gesehen</div>
-                            <div class="detail-value">${lastSeen}</div>
-                        </div>
-                    </div>
-                    
-                    <button class="btn btn-danger" onclick="removeSensor('${eui}')">Sensor entfernen</button>
-                </div>
-            `;
-        }
-        
-        // Base Station Karte erstellen
-        function createBaseStationCard(eui, data) {
-            const lastSeen = data.last_seen ? new Date(data.last_seen * 1000).toLocaleString() : 'Nie';
-            const status = data.status || {};
-            
-            return `
-                <div class="sensor-card">
-                    <div class="sensor-header">
-                        <div class="sensor-eui">${eui}</div>
-                        <div class="sensor-status">
-                            <div class="status-indicator"></div>
-                            <span>Online</span>
-                        </div>
-                    </div>
-                    
-                    <div class="sensor-details">
-                        <div class="detail-item">
-                            <div class="detail-label">CPU Auslastung</div>
-                            <div class="detail-value">${((status.cpuLoad || 0) * 100).toFixed(1)}%</div>
-                        </div>
-                        
-                        <div class="detail-item">
-                            <div class="detail-label">Memory Auslastung</div>
-                            <div class="detail-value">${((status.memLoad || 0) * 100).toFixed(1)}%</div>
-                        </div>
-                        
-                        <div class="detail-item">
-                            <div class="detail-label">Duty Cycle</div>
-                            <div class="detail-value">${((status.dutyCycle || 0) * 100).toFixed(1)}%</div>
-                        </div>
-                        
-                        <div class="detail-item">
-                            <div class="detail-label">Zuletzt gesehen</div>
-                            <div class="detail-value">${lastSeen}</div>
-                        </div>
-                    </div>
-                </div>
-            `;
-        }
-        
-        // Alert anzeigen
-        function showAlert(message, type = 'success') {
-            const alert = document.createElement('div');
-            alert.className = `alert alert-${type}`;
-            alert.textContent = message;
-            
-            alerts.appendChild(alert);
-            
-            setTimeout(() => {
-                alert.remove();
-            }, 5000);
-        }
-        
-        // Sensor hinzufügen
-        addSensorForm.addEventListener('submit', async (e) => {
-            e.preventDefault();
-            
-            const formData = new FormData(addSensorForm);
-            const data = {
-                sensor_eui: formData.get('sensor_eui'),
-                network_key: formData.get('network_key'),
-                short_addr: formData.get('short_addr'),
-                bidirectional: formData.get('bidirectional') === 'on'
-            };
-            
-            try {
-                const response = await fetch(BASE_URL + '/api/sensor/add', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify(data)
-                });
-                
-                const result = await response.json();
-                
-                if (response.ok) {
-                    showAlert(result.message, 'success');
-                    addSensorForm.reset();
-                    loadSensors(); // Liste neu laden
-                } else {
-                    showAlert(result.error, 'error');
-                }
-                
-            } catch (error) {
-                showAlert('Fehler beim Hinzufügen des Sensors', 'error');
-                console.error('Fehler:', error);
-            }
-        });
-        
-        // Sensor entfernen
-        async function removeSensor(eui) {
-            if (!confirm(`Sensor ${eui} wirklich entfernen?`)) {
-                return;
-            }
-            
-            try {
-                const response = await fetch(BASE_URL + '/api/sensor/remove', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({sensor_eui: eui})
-                });
-                
-                const result = await response.json();
-                
-                if (response.ok) {
-                    showAlert(result.message, 'success');
-                    loadSensors(); // Liste neu laden
-                } else {
-                    showAlert(result.error, 'error');
-                }
-                
-            } catch (error) {
-                showAlert('Fehler beim Entfernen des Sensors', 'error');
-                console.error('Fehler:', error);
-            }
-        }
-        
-        // Daten regelmäßig aktualisieren
-        function startAutoRefresh() {
-            loadSensors();
-            loadBaseStations();
-            
-            setInterval(() => {
-                loadSensors();
-                loadBaseStations();
-            }, 30000); // Alle 30 Sekunden
-        }
-        
-        // Start
-        document.addEventListener('DOMContentLoaded', () => {
-            startAutoRefresh();
-        });
-    </script>
-</body>
-</html>
-        '''
-    
-    # Service Center API Integration
-    def _get_service_center_client(self):
-        """Erstelle Service Center Client basierend auf Settings."""
-        settings = self.settings.get_settings()
-        service_center_url = settings.get('service_center_url', '').strip()
-        
-        if not service_center_url or not settings.get('service_center_enabled', False):
-            return None
-            
-        return create_service_center_client(service_center_url)
+        client = self._service_center_client
+        if client is None or client.base_url != service_center_url.rstrip('/'):
+            if client is not None:
+                client.close()
+            client = self._service_center_client = create_service_center_client(service_center_url)
+        return client
     
     def _format_timestamp(self, timestamp):
         """Formatiere Unix Timestamp zu lesbarem String."""
@@ -1660,13 +1364,25 @@ class WebGUI:
     def run(self):
         """Starte Flask Server."""
         try:
-            self.app.run(
-                host='0.0.0.0',
-                port=self.port,
-                debug=False,
-                use_reloader=False,
-                threaded=True
-            )
+            if WAITRESS_AVAILABLE:
+                # Läuft im Add-on-Prozess (eigener Thread), daher ein Prozess mit Thread-Pool:
+                # Sensor-Daten und Event-Streams liegen im Speicher dieses Prozesses.
+                logging.info(f"Web GUI: waitress WSGI-Server mit {WEB_SERVER_THREADS} Threads")
+                waitress_serve(
+                    self.app,
+                    host='0.0.0.0',
+                    port=self.port,
+                    threads=WEB_SERVER_THREADS,
+                    ident='mioty-application-center'
+                )
+            else:
+                self.app.run(
+                    host='0.0.0.0',
+                    port=self.port,
+                    debug=False,
+                    use_reloader=False,
+                    threaded=True
+                )
         except Exception as e:
             logging.error(f"Fehler beim Starten der Web GUI: {e}")
     
@@ -2485,7 +2201,7 @@ class WebGUI:
         }
         
         function updateAssignmentList() {
-            const assignments = Object.entries(currentAssignments);
+            const assignments = Object.entries(currentAssignments).sort(([a], [b]) => a < b ? -1 : a > b ? 1 : 0);
             if (assignments.length === 0) {
                 assignmentList.innerHTML = '<p>Keine Decoder-Zuweisungen vorhanden.</p>';
                 return;
@@ -2547,7 +2263,7 @@ class WebGUI:
                 const result = await response.json();
                 displayTestResult(result);
             } catch (error) {
-                displayTestResult({ decoded: false, reason: 'Netzwerk-Fehler', raw_data: [] });
+                displayTestResult({ decoded: false, reason: 'Netzwerk-Fehler', raw_data: null });
             }
         });
         
@@ -2560,7 +2276,8 @@ class WebGUI:
             } else {
                 html += `<p><strong>Grund:</strong> ${result.reason || 'Unbekannt'}</p>`;
             }
-            html += `<p><strong>Raw Data:</strong> <span class="code">[${result.raw_data?.join(', ') || 'Keine Daten'}]</span></p></div>`;
+            const rawData = (result.raw_data || '').toUpperCase();
+            html += `<p><strong>Raw Data:</strong> <span class="code">${rawData || 'Keine Daten'}</span></p></div>`;
             testResult.innerHTML = html;
         }
         
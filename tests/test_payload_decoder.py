@@ -0,0 +1,154 @@
+"""
+Regressionstests für den Payload Decoder (app/payload_decoder.py)
+Ausführen im Repository-Wurzelverzeichnis: python -m pytest tests
+"""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'app'))
+
+import payload_decoder  # noqa: E402
+
+BUNDLED_DECODERS = os.path.join(REPO_ROOT, 'decoders')
+NODE_AVAILABLE = shutil.which('node') is not None
+
+# Febris: Sentinum Header + Umweltwerte; Juno: Header mit Precision-TH-Block
+FEBRIS_PAYLOAD = bytes.fromhex('11120a0c4e7f0117026c27a3005d03f200')
+JUNO_PAYLOAD = bytes.fromhex('2121050c3e90000190')
+
+
+def run_js_decoder(file_name: str, payload: bytes):
+    """Führe die exportierte decode()-Funktion eines mitgelieferten JS Decoders direkt in Node.js aus."""
+    script = (
+        "const d = require(process.argv[1]);"
+        "const p = Array.from(Buffer.from(process.argv[2], 'hex'));"
+        "process.stdout.write(JSON.stringify(d.decode(p, {})));"
+    )
+    output = subprocess.run(['node', '-e', script, os.path.join(BUNDLED_DECODERS, file_name), payload.hex()],
+                            capture_output=True, text=True, check=True, timeout=10).stdout
+    return json.loads(output)
+
+
+class PayloadDecoderTestCase(unittest.TestCase):
+    """Decoder-Instanz mit einer Kopie der mitgelieferten JS Decoder in einem Temp-Verzeichnis."""
+    
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.decoder_dir = tempfile.mkdtemp()
+        for file_name in ('febris_universal.js', 'juno_th.js'):
+            shutil.copy(os.path.join(BUNDLED_DECODERS, file_name), self.decoder_dir)
+        self.decoder = payload_decoder.PayloadDecoder(self.decoder_dir)
+    
+    def tearDown(self):
+        self.decoder.shutdown()
+        shutil.rmtree(self.decoder_dir, ignore_errors=True)
+        logging.disable(logging.NOTSET)
+
+
+class KnownJsEngineTest(PayloadDecoderTestCase):
+    """Nur JS Decoder mit gleichwertiger Python-Nachbildung dürfen Node.js umgehen."""
+    
+    def test_febris_universal_keeps_node_path(self):
+        self.assertTrue(self.decoder.assign_decoder('AAAAAAAAAAAAAAAA', 'febris_universal'))
+        
+        result = self.decoder.decode_payload('AAAAAAAAAAAAAAAA', FEBRIS_PAYLOAD, {})
+        self.assertNotEqual(result.get('decoder_type'), 'febris_python')
+    
+    def test_juno_th_uses_python_port(self):
+        self.assertTrue(self.decoder.assign_decoder('BBBBBBBBBBBBBBBB', 'juno_th'))
+        
+        result = self.decoder.decode_payload('BBBBBBBBBBBBBBBB', JUNO_PAYLOAD, {})
+        self.assertTrue(result['decoded'])
+        self.assertEqual(result['decoder_type'], 'juno_python')
+    
+    @unittest.skipUnless(NODE_AVAILABLE, 'Node.js nicht installiert')
+    def test_febris_universal_matches_js_output(self):
+        self.decoder.assign_decoder('AAAAAAAAAAAAAAAA', 'febris_universal')
+        
+        result = self.decoder.decode_payload('AAAAAAAAAAAAAAAA', FEBRIS_PAYLOAD, {})
+        self.assertTrue(result['decoded'])
+        self.assertEqual(result['data'], run_js_decoder('febris_universal.js', FEBRIS_PAYLOAD))
+
+
+@unittest.skipUnless(NODE_AVAILABLE, 'Node.js nicht installiert')
+class NodeWorkerProtocolTest(PayloadDecoderTestCase):
+    """Anfrage {f, p, m} -> Antwort {ok, data} bzw. {ok: false, error} über den persistenten Worker."""
+    
+    def write_decoder(self, file_name: str, source: str) -> str:
+        file_path = os.path.join(self.decoder_dir, file_name)
+        with open(file_path, 'w') as f:
+            f.write(source)
+        return file_path
+    
+    def test_decode_reply(self):
+        file_path = self.write_decoder('echo.js', (
+            "module.exports = { decode: (payload, metadata) => {"
+            " console.log('Decoder-Ausgabe'); return { payload: payload, metadata: metadata }; } };"
+        ))
+        
+        # Mehrere Anfragen hintereinander: console.log darf die Antwortzeilen nicht verschieben
+        for payload in (b'\x01\x02', b'', bytes(range(256))):
+            reply = self.decoder._node_worker_decode(file_path, payload, {'rssi': -90})
+            self.assertEqual(reply, {'ok': True, 'data': {'payload': list(payload), 'metadata': {'rssi': -90}}})
+    
+    def test_function_export(self):
+        file_path = self.write_decoder('plain.js', "module.exports = (payload) => payload.length;")
+        
+        self.assertEqual(self.decoder._node_worker_decode(file_path, b'\x00\x00\x00', None),
+                         {'ok': True, 'data': 3})
+    
+    def test_error_reply(self):
+        file_path = self.write_decoder('broken.js', "module.exports = { decode: () => { throw new Error('kaputt'); } };")
+        
+        self.assertEqual(self.decoder._node_worker_decode(file_path, b'\x01', {}),
+                         {'ok': False, 'error': 'kaputt'})
+        # Der Worker bleibt nach einem Decoder-Fehler nutzbar
+        self.assertEqual(self.decoder._node_worker_decode(
+            os.path.join(self.decoder_dir, 'febris_universal.js'), FEBRIS_PAYLOAD, {}),
+            {'ok': True, 'data': run_js_decoder('febris_universal.js', FEBRIS_PAYLOAD)})
+    
+    def test_changed_decoder_is_reloaded(self):
+        file_path = self.write_decoder('version.js', "module.exports = { decode: () => 1 };")
+        self.assertEqual(self.decoder._node_worker_decode(file_path, b'', {})['data'], 1)
+        
+        self.write_decoder('version.js', "module.exports = { decode: () => 2 };")
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        # Jeder Worker-Slot muss die neue Version laden
+        for _ in range(payload_decoder.NODE_WORKER_COUNT):
+            self.assertEqual(self.decoder._node_worker_decode(file_path, b'', {})['data'], 2)
+    
+    def test_hanging_worker_is_killed_and_reaped(self):
+        file_path = self.write_decoder('hang.js', "module.exports = { decode: () => { for (;;) {} } };")
+        
+        with mock.patch.object(payload_decoder, 'NODE_TIMEOUT', 0.5), \
+                mock.patch.object(self.decoder, '_kill_node_worker',
+                                  wraps=self.decoder._kill_node_worker) as kill:
+            with self.assertRaises(subprocess.TimeoutExpired):
+                self.decoder._node_worker_decode(file_path, b'', {})
+        
+        # Prozess beendet, Exit-Status abgeholt und Pipes geschlossen
+        proc = kill.call_args[0][0]
+        self.assertIsNotNone(proc.returncode)
+        self.assertTrue(proc.stdin.closed)
+        self.assertTrue(proc.stdout.closed)
+        self.assertNotIn(proc, self.decoder._node_procs)
+        
+        # Der Slot startet beim nächsten Aufruf einen neuen Worker
+        plain = self.write_decoder('plain.js', "module.exports = (payload) => payload.length;")
+        for _ in range(payload_decoder.NODE_WORKER_COUNT):
+            self.assertEqual(self.decoder._node_worker_decode(plain, b'\x00', {})['data'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()